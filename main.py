@@ -10,6 +10,7 @@ Usage:
     python main.py          Launch the GUI application
 """
 
+import importlib.util
 import logging
 import sys
 
@@ -24,17 +25,11 @@ logger = logging.getLogger("yt_merge")
 
 def check_dependencies():
     """Verify required packages are installed and give clear messages if not."""
-    missing = []
-
-    try:
-        import yt_dlp  # noqa: F401
-    except ImportError:
-        missing.append("yt-dlp")
-
-    try:
-        import customtkinter  # noqa: F401
-    except ImportError:
-        missing.append("customtkinter")
+    # find_spec only locates the packages — yt-dlp is imported on first use
+    missing = [
+        pkg for pkg, module in (("yt-dlp", "yt_dlp"), ("customtkinter", "customtkinter"))
+        if importlib.util.find_spec(module) is None
+    ]
 
     if missing:
         print("\n" + "=" * 55)
@@ -3,17 +3,20 @@ config.py — Application constants, hardware detection, and user settings.
 
 Handles:
   • Resolution presets and codec defaults
-  • Lazy NVIDIA GPU (NVENC) detection with CPU fallback
+  • Lazy, cached NVIDIA GPU (NVENC) detection with CPU fallback
   • Central AppSettings dataclass for all user-configurable options
   • Cache directory management
 """
 
+import ctypes
+import functools
+import hashlib
 import os
 import shutil
 import subprocess
 import logging
-from dataclasses import dataclass, field
-from typing import Tuple, List
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -33,54 +36,197 @@ AUDIO_SAMPLE_RATE  = 44100
 AUDIO_CHANNELS     = 2
 FADE_DURATION      = 0.5
 
+# ─── Output Container ────────────────────────────────────────
+# +faststart rewrites the whole MP4 in a second pass to move the index up
+# front; above this size the output is written in a single pass instead.
+FASTSTART_MAX_BYTES = 2 * 1024 ** 3
+FRAGMENTED_MOVFLAGS = "+frag_keyframe+empty_moov+default_base_moof"
+
+# ─── Child Processes ─────────────────────────────────────────
+# creationflags for console tools: on Windows a GUI app would otherwise flash
+# a console window for every ffmpeg / ffprobe run (0 elsewhere)
+NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
 # ─── Download Defaults ────────────────────────────────────────
 MAX_CONCURRENT_DOWNLOADS = 3
 MAX_RETRIES              = 3
 CONCURRENT_FRAGMENTS     = 8
+GLOBAL_HTTP_BUDGET       = 16      # total sockets shared by all parallel downloads
+SOCKET_TIMEOUT           = 30
+
+# aria2c (optional, used when on PATH): one event loop, keep-alive connections.
+# Per-download connection counts are added from the HTTP budget at run time.
+ARIA2C_ARGS = [
+    "--min-split-size=1M",
+    "--enable-http-keep-alive=true", "--enable-http-pipelining=true",
+    "--console-log-level=warn", "--summary-interval=0",
+]
 
 
 # ─── Encoder Detection ───────────────────────────────────────
 
+# Values each encoder accepts for -preset / -tune; user overrides outside
+# these would otherwise only fail inside ffmpeg, once per clip
+_CODEC_PRESETS = {
+    "libx264": frozenset({
+        "ultrafast", "superfast", "veryfast", "faster", "fast",
+        "medium", "slow", "slower", "veryslow", "placebo",
+    }),
+    "h264_nvenc": frozenset({
+        "p1", "p2", "p3", "p4", "p5", "p6", "p7",
+        "default", "slow", "medium", "fast", "hp", "hq", "bd",
+        "ll", "llhq", "llhp", "lossless", "losslesshp",
+    }),
+}
+_CODEC_TUNES = {
+    "libx264": frozenset({
+        "film", "animation", "grain", "stillimage",
+        "fastdecode", "zerolatency", "psnr", "ssim",
+    }),
+    "h264_nvenc": frozenset({"hq", "ll", "ull", "lossless"}),
+}
+
+
 @dataclass
 class EncoderProfile:
     """Holds the detected (or fallback) encoder settings."""
     codec: str = "libx264"
     hwaccel_args: List[str] = field(default_factory=list)
-    quality_args: List[str] = field(default_factory=lambda: ["-crf", "23"])
-    preset: str = "ultrafast"
+    # Sliced threads let x264 spread each frame across all cores
+    quality_args: List[str] = field(default_factory=lambda: [
+        "-crf", "23", "-x264-params", "sliced-threads=1",
+    ])
+    preset: str = "superfast"
+    tune: str = "zerolatency"
+    threads: int = field(default_factory=lambda: os.cpu_count() or 1)
     is_gpu: bool = False
 
     @property
     def label(self) -> str:
         return f"{self.codec} ({'GPU' if self.is_gpu else 'CPU'})"
 
+    @property
+    def signature(self) -> str:
+        """
+        Short hash of everything that shapes the encoded bitstream (codec,
+        preset, tune, quality args).  Clips made under different profiles
+        can't be concat-copied together, so caches key on this; changing a
+        default or an override changes it.  Thread count is left out — it
+        varies with the worker split, not with the stream's parameters.
+        """
+        key = "|".join([self.codec, self.preset, self.tune, *self.quality_args])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
 
-def detect_encoder() -> EncoderProfile:
+    @property
+    def video_args(self) -> List[str]:
+        """FFmpeg output arguments for the video stream."""
+        args = ["-c:v", self.codec, "-preset", self.preset]
+        if self.tune:
+            args += ["-tune", self.tune]
+        if not self.is_gpu:
+            # NVENC ignores -threads; x264 uses it to size its thread pool
+            args += ["-threads", str(self.threads)]
+        return args + self.quality_args
+
+    def with_overrides(self, preset: str = "", tune: str = "") -> "EncoderProfile":
+        """
+        Return a copy with user-supplied preset / tune applied (blank = keep).
+        Values this codec doesn't accept are logged and ignored.
+        """
+        return replace(
+            self,
+            preset=self._checked("preset", preset, self.preset, _CODEC_PRESETS),
+            tune=self._checked("tune", tune, self.tune, _CODEC_TUNES),
+        )
+
+    def _checked(self, kind: str, value: str, default: str, table: dict) -> str:
+        if not value:
+            return default
+        allowed = table.get(self.codec)
+        if allowed is not None and value not in allowed:
+            logger.warning(
+                "%s does not support %s %r — using %r", self.codec, kind, value, default,
+            )
+            return default
+        return value
+
+
+def _nvml_device_count() -> Optional[int]:
     """
-    Auto-detect NVIDIA GPU via nvidia-smi.
-    Returns an NVENC profile if available, otherwise falls back to libx264.
+    Count NVIDIA GPUs through the driver's NVML library (~10 ms, no fork).
+    Returns None when NVML can't be loaded so the caller can fall back.
     """
-    if not shutil.which("nvidia-smi"):
-        logger.info("nvidia-smi not found — using CPU encoder (libx264)")
-        return EncoderProfile()
+    names = ["nvml.dll"] if os.name == "nt" else ["libnvidia-ml.so.1", "libnvidia-ml.so"]
+    for name in names:
+        try:
+            nvml = ctypes.CDLL(name)
+            break
+        except OSError:
+            continue
+    else:
+        return None
+
+    try:
+        if nvml.nvmlInit_v2() != 0:
+            return 0
+        count = ctypes.c_uint(0)
+        ok = nvml.nvmlDeviceGetCount_v2(ctypes.byref(count)) == 0
+        nvml.nvmlShutdown()
+        return count.value if ok else 0
+    except AttributeError:
+        return None
+
 
+def _nvidia_smi_ok() -> bool:
+    """Slower fallback probe: does `nvidia-smi` run successfully?"""
+    if not shutil.which("nvidia-smi"):
+        logger.info("nvidia-smi not found")
+        return False
     try:
-        result = subprocess.run(
+        subprocess.run(
             ["nvidia-smi"], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-            timeout=5, check=True,
-        )
-        logger.info("NVIDIA GPU detected — using h264_nvenc")
-        return EncoderProfile(
-            codec="h264_nvenc",
-            hwaccel_args=["-hwaccel", "cuda"],
-            quality_args=["-cq", "23", "-spatial_aq", "1"],
-            preset="p4",
-            is_gpu=True,
+            timeout=5, check=True, creationflags=NO_WINDOW,
         )
+        return True
     except (subprocess.SubprocessError, FileNotFoundError, OSError) as exc:
-        logger.warning("GPU detection failed (%s) — falling back to CPU", exc)
+        logger.warning("GPU detection failed (%s)", exc)
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def detect_encoder() -> EncoderProfile:
+    """
+    Auto-detect an NVIDIA GPU via NVML (falling back to nvidia-smi).
+    Returns an NVENC profile if available, otherwise falls back to libx264.
+    The result is cached — treat it as read-only; see reset_encoder_cache().
+    """
+    count = _nvml_device_count()
+    has_gpu = count > 0 if count is not None else _nvidia_smi_ok()
+    if not has_gpu:
+        logger.info("No NVIDIA GPU detected — using CPU encoder (libx264)")
         return EncoderProfile()
 
+    logger.info("NVIDIA GPU detected — using h264_nvenc")
+    # Fastest NVENC preset, no lookahead / B-frames: merge output tolerates
+    # a little quality loss in exchange for much higher throughput
+    return EncoderProfile(
+        codec="h264_nvenc",
+        hwaccel_args=["-hwaccel", "cuda"],
+        quality_args=[
+            "-cq", "28", "-rc-lookahead", "0",
+            "-spatial_aq", "0", "-temporal_aq", "0",
+            "-bf", "0", "-g", "120",
+        ],
+        preset="p1",
+        tune="ll",
+        is_gpu=True,
+    )
+
+
+def reset_encoder_cache() -> None:
+    """Forget the detected encoder so the next detect_encoder() re-probes."""
+    detect_encoder.cache_clear()
+
 
 # ─── Cache Directory ──────────────────────────────────────────
 
@@ -104,6 +250,12 @@ class AppSettings:
     fade_duration: float = FADE_DURATION
     background_music: str = ""
     music_volume: float = 0.15
+    encoder_preset: str = ""            # blank = detected encoder default
+    encoder_tune: str = ""              # blank = detected encoder default
+    audio_encoder: str = ""             # blank = libfdk_aac if built in, else aac
+    # Fragmented MP4 streams the index inline (no second pass) but some
+    # older players and editors can't seek in it
+    fragmented_mp4: bool = False
     max_concurrent_downloads: int = MAX_CONCURRENT_DOWNLOADS
 
     @property
@@ -113,3 +265,11 @@ class AppSettings:
     @property
     def resolution_height(self) -> int:
         return self.resolution_wh[1]
+
+    def connections_per_download(self, queued: int) -> int:
+        """
+        Share GLOBAL_HTTP_BUDGET between the downloads that run at once,
+        so parallel workers don't trip YouTube's per-IP throttling.
+        """
+        active = max(1, min(self.max_concurrent_downloads, queued))
+        return max(2, min(CONCURRENT_FRAGMENTS, GLOBAL_HTTP_BUDGET // active))
@@ -3,22 +3,28 @@ downloader.py — yt-dlp download manager with per-video progress and retry.
 
 Features:
   • Real per-video progress via yt-dlp progress_hooks
-  • Automatic retry with exponential backoff
+  • Automatic request/fragment-level retry with exponential backoff (yt-dlp)
   • Resume support (continuedl)
-  • Cache-aware: skips re-download if file already exists
+  • One reusable YoutubeDL instance per worker thread (extractors load once)
+  • aria2c external downloader when available (connection reuse)
+  • Cache-aware: skips yt-dlp entirely if the file is already cached
   • Thread-safe callbacks for GUI updates
 """
 
 import logging
 import os
+import shutil
+import threading
 import time
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional
 
 import yt_dlp
 
-from .config import AppSettings, get_cache_dir, MAX_RETRIES, CONCURRENT_FRAGMENTS
+from .config import (
+    AppSettings, get_cache_dir, MAX_RETRIES, SOCKET_TIMEOUT, ARIA2C_ARGS,
+)
 from .models import VideoEntry, VideoStatus
-from .utils import sanitize_filename
+from .utils import extract_video_id, get_video_duration, sanitize_filename
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +32,53 @@ logger = logging.getLogger(__name__)
 ProgressCallback = Callable[[VideoEntry, str], None]
 
 
+# Extension preference when several variants of a download exist on disk
+_EXT_PREFERENCE = {".mp4": 0, ".mkv": 1, ".webm": 2, ".m4a": 3}
+_EXT_IGNORED = {".part", ".ytdl", ".temp"}
+
+_PROGRESS_INTERVAL = 0.1    # seconds between progress updates per download
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential retry delay for yt-dlp (capped at 30 s)."""
+    return min(2 ** attempt, 30)
+
+
+class _ProgressHook:
+    """
+    yt-dlp progress hook for one entry (fires per fragment).
+    Built once per download and shared by every yt-dlp retry.
+    """
+    __slots__ = ("entry", "on_progress", "_last_ts")
+
+    def __init__(self, entry: VideoEntry, on_progress: ProgressCallback):
+        self.entry = entry
+        self.on_progress = on_progress
+        self._last_ts = 0.0
+
+    def __call__(self, d: dict) -> None:
+        status = d["status"]
+        if status == "downloading":
+            # Fragments can tick at 100+ Hz; ~10 Hz is plenty for the GUI
+            now = time.monotonic()
+            if now - self._last_ts < _PROGRESS_INTERVAL:
+                return
+            self._last_ts = now
+            try:
+                total_bytes = d["total_bytes"]
+            except KeyError:
+                total_bytes = None
+            if not total_bytes:
+                total_bytes = d.get("total_bytes_estimate")
+            if total_bytes:
+                self.entry.set_progress(d.get("downloaded_bytes", 0) / total_bytes)
+            speed = d.get("speed")
+            if speed:
+                self.on_progress(self.entry, f"{speed / 1_048_576:.1f} MB/s")
+        elif status == "finished":
+            self.entry.set_progress(1.0)
+
+
 class DownloadManager:
     """
     Wraps yt-dlp to download a single VideoEntry with progress hooks,
@@ -38,115 +91,188 @@ class DownloadManager:
         cache_dir: Optional[str] = None,
         on_progress: Optional[ProgressCallback] = None,
         on_log: Optional[Callable[[str], None]] = None,
+        ffprobe: str = "ffprobe",
     ):
         self.settings = settings
         self.cache_dir = cache_dir or get_cache_dir()
+        self.ffprobe = ffprobe
         self.on_progress = on_progress or (lambda *_: None)
         self.on_log = on_log or logger.info
         self._cancelled = False
+        self._aria2c = shutil.which("aria2c")
+        if self._aria2c:
+            logger.info("aria2c found — using it as yt-dlp's external downloader")
+
+        # YoutubeDL isn't thread-safe, so each worker thread keeps its own
+        # instances; progress is routed to that thread's current entry.
+        self._local = threading.local()
+        self._all_ydl: List[yt_dlp.YoutubeDL] = []
+        self._ydl_lock = threading.Lock()
 
     def cancel(self) -> None:
         self._cancelled = True
 
+    def close(self) -> None:
+        """Release every cached YoutubeDL instance (call once downloads are done)."""
+        with self._ydl_lock:
+            instances, self._all_ydl = self._all_ydl, []
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception as exc:
+                logger.debug("YoutubeDL close failed: %s", exc)
+
     def download(self, entry: VideoEntry, index: int, total: int) -> bool:
         """
         Download a single video.  Returns True on success.
 
-        Retries up to MAX_RETRIES times on failure.
-        Skips download entirely if the cached file already exists.
+        yt-dlp retries each failed request / fragment up to MAX_RETRIES times.
+        Skips yt-dlp entirely (no network) if the cached file already exists.
         """
         if self._cancelled:
             entry.set_status(VideoStatus.CANCELLED)
             return False
 
         res_h = self.settings.resolution_height
+        if self._use_cached(entry, res_h, index, total):
+            return True
+
         cache_pattern = os.path.join(self.cache_dir, f"%(id)s_{res_h}.%(ext)s")
+        connections = self.settings.connections_per_download(total)
+        progress_hook = _ProgressHook(entry, self.on_progress)
 
-        for attempt in range(1, MAX_RETRIES + 1):
-            if self._cancelled:
-                entry.set_status(VideoStatus.CANCELLED)
-                return False
+        opts = {
+            "format": (
+                f"bestvideo[height<={res_h}][ext=mp4]+bestaudio[ext=m4a]"
+                f"/bestvideo[height<={res_h}]+bestaudio"
+                f"/best[height<={res_h}]/best"
+            ),
+            "merge_output_format": "mp4",
+            "outtmpl": cache_pattern,
+            "quiet": True,
+            "no_warnings": True,
+            "continuedl": True,
+            # Retries happen per request / fragment inside yt-dlp, so a failure
+            # never re-runs the whole extraction
+            "retries": MAX_RETRIES,
+            "fragment_retries": MAX_RETRIES,
+            "extractor_retries": 2,
+            "retry_sleep_functions": {"http": _backoff, "fragment": _backoff},
+            "socket_timeout": SOCKET_TIMEOUT,
+            "concurrent_fragment_downloads": connections,
+        }
+        if self._aria2c:
+            opts["external_downloader"] = {"default": "aria2c"}
+            opts["external_downloader_args"] = {"aria2c": ARIA2C_ARGS + [
+                f"--max-connection-per-server={connections}",
+                f"--split={connections}",
+            ]}
 
+        try:
+            entry.set_status(VideoStatus.DOWNLOADING)
+            entry.set_progress(0.0)
+            self.on_log(f"⬇  [{index+1}/{total}] Downloading: {entry.url}")
+
+            ydl = self._get_ydl(opts)
+            self._local.hook = progress_hook
             try:
-                entry.set_status(VideoStatus.DOWNLOADING)
-                entry.set_progress(0.0)
-                self.on_log(f"⬇  [{index+1}/{total}] Downloading: {entry.url}"
-                            + (f" (attempt {attempt})" if attempt > 1 else ""))
-
-                # ── yt-dlp progress hook (fires per fragment) ──
-                def _progress_hook(d, _entry=entry):
-                    if d.get("status") == "downloading":
-                        total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
-                        downloaded = d.get("downloaded_bytes", 0)
-                        if total_bytes > 0:
-                            _entry.set_progress(downloaded / total_bytes)
-                        speed = d.get("speed")
-                        if speed:
-                            speed_str = f"{speed / 1_048_576:.1f} MB/s"
-                            self.on_progress(_entry, speed_str)
-                    elif d.get("status") == "finished":
-                        _entry.set_progress(1.0)
-
-                opts = {
-                    "format": (
-                        f"bestvideo[height<={res_h}][ext=mp4]+bestaudio[ext=m4a]"
-                        f"/bestvideo[height<={res_h}]+bestaudio"
-                        f"/best[height<={res_h}]/best"
-                    ),
-                    "merge_output_format": "mp4",
-                    "outtmpl": cache_pattern,
-                    "quiet": True,
-                    "no_warnings": True,
-                    "continuedl": True,
-                    "retries": 3,
-                    "concurrent_fragment_downloads": CONCURRENT_FRAGMENTS,
-                    "progress_hooks": [_progress_hook],
-                }
-
-                with yt_dlp.YoutubeDL(opts) as ydl:
-                    info = ydl.extract_info(entry.url, download=True)
-                    entry.title = sanitize_filename(info.get("title", f"video_{index}"))
-                    entry.video_id = info.get("id", str(index))
-                    entry.duration = info.get("duration", 0.0) or 0.0
-                    entry.thumbnail_url = info.get("thumbnail", "")
-
-                    # Locate the downloaded file
-                    prepared = ydl.prepare_filename(info)
-                    entry.downloaded_path = self._resolve_file(prepared)
-
-                if not entry.downloaded_path:
-                    raise FileNotFoundError("Downloaded file could not be located on disk")
-
-                entry.set_status(VideoStatus.DOWNLOADED)
-                self.on_log(f"  ✔ {entry.title}")
-                return True
+                info = ydl.extract_info(entry.url, download=True)
+            finally:
+                self._local.hook = None
+            entry.title = sanitize_filename(info.get("title", f"video_{index}"))
+            entry.video_id = info.get("id", str(index))
+            entry.duration = info.get("duration", 0.0) or 0.0
+            entry.thumbnail_url = info.get("thumbnail", "")
+            acodec = info.get("acodec")
+            entry.has_audio = None if acodec is None else acodec != "none"
 
-            except Exception as exc:
-                wait = 2 ** attempt
-                self.on_log(f"  ✖ Attempt {attempt} failed: {str(exc)[:80]}")
-                if attempt < MAX_RETRIES:
-                    self.on_log(f"  ↻ Retrying in {wait}s …")
-                    time.sleep(wait)
-                else:
-                    entry.set_status(VideoStatus.ERROR, error=str(exc)[:120])
-                    self.on_log(f"  ✖ Download failed permanently: {entry.url}")
-                    return False
-
-        return False  # unreachable but keeps linters happy
+            # Locate the downloaded file
+            prepared = ydl.prepare_filename(info)
+            entry.downloaded_path = self._resolve_file(prepared)
+
+            if not entry.downloaded_path:
+                raise FileNotFoundError("Downloaded file could not be located on disk")
+
+            entry.set_status(VideoStatus.DOWNLOADED)
+            self.on_log(f"  ✔ {entry.title}")
+            return True
+
+        except Exception as exc:
+            entry.set_status(VideoStatus.ERROR, error=str(exc)[:120])
+            self.on_log(f"  ✖ Download failed: {str(exc)[:80]}")
+            return False
 
     # ── Internal helpers ─────────────────────────────────────
 
+    def _get_ydl(self, opts: dict) -> yt_dlp.YoutubeDL:
+        """Return this thread's YoutubeDL for `opts`, creating it on first use."""
+        cache: Optional[Dict[str, yt_dlp.YoutubeDL]] = getattr(self._local, "ydl", None)
+        if cache is None:
+            cache = self._local.ydl = {}
+        key = repr(sorted(opts.items()))
+        ydl = cache.get(key)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(opts)
+            ydl.add_progress_hook(self._dispatch_progress)
+            cache[key] = ydl
+            with self._ydl_lock:
+                self._all_ydl.append(ydl)
+        return ydl
+
+    def _dispatch_progress(self, d: dict) -> None:
+        """Shared yt-dlp hook: forward to the calling thread's current entry."""
+        hook = getattr(self._local, "hook", None)
+        if hook:
+            hook(d)
+
+    def _use_cached(self, entry: VideoEntry, res_h: int, index: int, total: int) -> bool:
+        """Short-circuit to DOWNLOADED if this video is already in the cache."""
+        vid = extract_video_id(entry.url)
+        if not vid:
+            return False
+        cached = self._resolve_file(os.path.join(self.cache_dir, f"{vid}_{res_h}.mp4"))
+        if not cached:
+            return False
+
+        entry.video_id = vid
+        entry.downloaded_path = cached
+        # No extraction ran, so keep what the entry already knows; the length
+        # (for per-clip progress) comes from the cached ffprobe otherwise
+        if not entry.duration:
+            entry.duration = get_video_duration(cached, self.ffprobe)
+        entry.set_status(VideoStatus.DOWNLOADED)
+        self.on_log(
+            f"⚡ [{index+1}/{total}] Cached — skipped download: {entry.title or entry.url}"
+        )
+        return True
+
     @staticmethod
     def _resolve_file(prepared_path: str) -> str:
         """
         yt-dlp's prepare_filename may not match the actual extension
-        after muxing (e.g., .webm → .mp4).  Try common variants.
+        after muxing (e.g., .webm → .mp4).  One directory scan finds every
+        `<base>.<ext>` variant; the prepared name wins, then _EXT_PREFERENCE.
+        yt-dlp leftovers (.part, .ytdl, per-format .f137.mp4) are ignored.
         """
-        if os.path.isfile(prepared_path):
-            return prepared_path
-        base = os.path.splitext(prepared_path)[0]
-        for ext in (".mp4", ".mkv", ".webm", ".m4a"):
-            candidate = base + ext
-            if os.path.isfile(candidate):
-                return candidate
-        return ""
+        dirname, filename = os.path.split(prepared_path)
+        base = os.path.splitext(filename)[0]
+        prefix = base + "."
+
+        best, best_rank = "", None
+        try:
+            with os.scandir(dirname or ".") as it:
+                for e in it:
+                    if not e.name.startswith(prefix):
+                        continue
+                    ext = e.name[len(base):]
+                    if "." in ext[1:] or ext in _EXT_IGNORED or not e.is_file():
+                        continue
+                    if e.name == filename:
+                        rank = -1
+                    else:
+                        rank = _EXT_PREFERENCE.get(ext, len(_EXT_PREFERENCE))
+                    if best_rank is None or rank < best_rank:
+                        best, best_rank = e.path, rank
+        except OSError:
+            return ""
+        return best
@@ -3,31 +3,48 @@ engine.py — Pipeline orchestrator for download → process → merge.
 
 Coordinates:
   • Parallel downloads via ThreadPoolExecutor
-  • Sequential processing (GPU can only do one encode at a time)
-  • Smart merge: fast concat (copy) or xfade (re-encode)
-  • Background music overlay
+  • Concurrent processing (bounded by encoder type), overlapped with
+    the downloads through a work queue
+  • Smart merge: fast concat (copy) or xfade (re-encodes only the joins),
+    driven by asyncio subprocesses so independent segments run in parallel
+  • Background music mixed into the merge pass (single FFmpeg run)
   • Cancellation at every stage
   • Aggregated progress reporting
 """
 
+import asyncio
+import functools
 import logging
 import os
+import queue
 import shutil
 import subprocess
+import tempfile
+import threading
+from collections import deque
+from dataclasses import replace
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, List, Optional
+from itertools import accumulate
+from typing import Callable, Deque, List, Optional, Set, Tuple
 
 from .config import (
-    AppSettings, EncoderProfile, detect_encoder, get_cache_dir,
-    AUDIO_CODEC,
+    AppSettings, EncoderProfile, detect_encoder, get_cache_dir, NO_WINDOW, TARGET_FPS,
+    FASTSTART_MAX_BYTES, FRAGMENTED_MOVFLAGS,
+    AUDIO_CODEC, AUDIO_BITRATE,
 )
 from .downloader import DownloadManager
 from .models import VideoEntry, VideoStatus
-from .processor import VideoProcessor
-from .utils import find_ffmpeg, get_video_duration
+from .processor import VideoProcessor, encode_workers
+from .utils import (
+    fast_copy, ffmpeg_has_encoder, ffmpeg_has_filter, find_ffmpeg,
+    probe_durations, probe_keyframes,
+)
 
 logger = logging.getLogger(__name__)
 
+# Concurrent ffmpeg runs while building xfade segments (cuts + joins)
+_SEGMENT_JOBS = 2
+
 # Callback types
 LogCallback = Callable[[str], None]
 ProgressCallback = Callable[[str, int, int], None]  # (stage, current, total)
@@ -36,10 +53,9 @@ ProgressCallback = Callable[[str, int, int], None]  # (stage, current, total)
 class MergeEngine:
     """
     Orchestrates the full pipeline:
-      1. Download all videos (parallel)
-      2. Normalize each video (sequential — GPU bound)
-      3. Merge into final output
-      4. Optionally overlay background music
+      1. Download all videos (parallel), normalizing each one as soon as it
+         lands (a few clips at a time, bounded by the encoder)
+      2. Merge into final output (optionally mixing in background music)
     """
 
     def __init__(
@@ -54,7 +70,9 @@ class MergeEngine:
 
         # Lazy init — may raise if ffmpeg missing
         self.ffmpeg, self.ffprobe = find_ffmpeg()
-        self.encoder: EncoderProfile = detect_encoder()
+        self.encoder: EncoderProfile = detect_encoder().with_overrides(
+            preset=settings.encoder_preset, tune=settings.encoder_tune,
+        )
         self.cache_dir = get_cache_dir()
 
         self.videos: List[VideoEntry] = []
@@ -63,6 +81,8 @@ class MergeEngine:
         # Sub-components
         self._downloader: Optional[DownloadManager] = None
         self._processor: Optional[VideoProcessor] = None
+        self._merge_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ffmpeg_procs: Set[asyncio.subprocess.Process] = set()
 
     # ── Public API ───────────────────────────────────────────
 
@@ -73,6 +93,12 @@ class MergeEngine:
             self._downloader.cancel()
         if self._processor:
             self._processor.cancel()
+        loop = self._merge_loop
+        if loop and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._terminate_ffmpeg)
+            except RuntimeError:
+                pass    # loop finished between the check and the call
 
     def run(self) -> bool:
         """
@@ -90,21 +116,14 @@ class MergeEngine:
         self.on_log(f"   Cache: {self.cache_dir}\n")
 
         try:
-            # ── Stage 1: Download ────────────────────────────
-            if not self._stage_download():
-                return False
-
-            # ── Stage 2: Process ─────────────────────────────
-            if not self._stage_process():
+            # ── Stage 1: Download + Process (overlapped) ─────
+            if not self._stage_download_and_process():
                 return False
 
-            # ── Stage 3: Merge ───────────────────────────────
-            if not self._stage_merge():
+            # ── Stage 2: Merge (+ music) ─────────────────────
+            if not asyncio.run(self._stage_merge(self._resolve_music())):
                 return False
 
-            # ── Stage 4: Music overlay (optional) ────────────
-            self._stage_music()
-
             self.on_log(f"\n✅ SUCCESS → {self.settings.output_path}")
             self.on_progress("done", total, total)
             return True
@@ -114,11 +133,16 @@ class MergeEngine:
             logger.exception("Pipeline failed")
             return False
 
-    # ── Stage 1: Parallel Downloads ──────────────────────────
+    # ── Stage 1: Downloads overlapped with Processing ────────
 
-    def _stage_download(self) -> bool:
+    def _stage_download_and_process(self) -> bool:
+        """
+        Download in parallel and feed each finished file straight to the
+        processing workers, so encode time hides download time (and vice versa).
+        Up to encode_workers() clips are encoded at once.
+        """
         self.on_log("━" * 50)
-        self.on_log("STAGE 1 / 3 — Downloading")
+        self.on_log("STAGE 1 / 2 — Downloading & Processing")
         self.on_log("━" * 50)
 
         self._downloader = DownloadManager(
@@ -126,46 +150,16 @@ class MergeEngine:
             cache_dir=self.cache_dir,
             on_progress=self._dl_progress_relay,
             on_log=self.on_log,
+            ffprobe=self.ffprobe,
         )
-
-        total = len(self.videos)
-        completed = 0
-
-        with ThreadPoolExecutor(max_workers=self.settings.max_concurrent_downloads) as pool:
-            futures = {
-                pool.submit(self._downloader.download, v, i, total): i
-                for i, v in enumerate(self.videos)
-            }
-            for future in as_completed(futures):
-                if self._cancelled:
-                    return False
-                completed += 1
-                self.on_progress("download", completed, total)
-
-        # Check how many succeeded
-        ok = sum(1 for v in self.videos if v.status == VideoStatus.DOWNLOADED)
-        if ok == 0:
-            self.on_log("✖ All downloads failed.")
-            return False
-        if ok < total:
-            self.on_log(f"⚠ {total - ok} download(s) failed — continuing with {ok}.")
-        return True
-
-    def _dl_progress_relay(self, entry: VideoEntry, speed_str: str) -> None:
-        """Relay per-video speed info (called from download threads)."""
-        # This just updates the entry; GUI polls via to_dict()
-        pass
-
-    # ── Stage 2: Sequential Processing ───────────────────────
-
-    def _stage_process(self) -> bool:
-        self.on_log("\n" + "━" * 50)
-        self.on_log("STAGE 2 / 3 — Processing & Normalizing")
-        self.on_log("━" * 50)
-
+        n_workers = min(encode_workers(self.encoder), len(self.videos))
+        encoder = self.encoder
+        if not encoder.is_gpu:
+            # Split the cores between the concurrent x264 runs
+            encoder = replace(encoder, threads=max(1, encoder.threads // n_workers))
         self._processor = VideoProcessor(
             settings=self.settings,
-            encoder=self.encoder,
+            encoder=encoder,
             ffmpeg=self.ffmpeg,
             ffprobe=self.ffprobe,
             cache_dir=self.cache_dir,
@@ -173,12 +167,63 @@ class MergeEngine:
         )
 
         total = len(self.videos)
-        for i, v in enumerate(self.videos):
-            if self._cancelled:
-                return False
-            if v.status == VideoStatus.DOWNLOADED:
-                self._processor.process(v, i, total)
-            self.on_progress("process", i + 1, total)
+        work: "queue.Queue[Optional[int]]" = queue.Queue()
+        downloads_done = threading.Event()
+        processed = [0]
+        processed_lock = threading.Lock()
+
+        def _process_worker():
+            while True:
+                i = work.get()
+                if i is None or self._cancelled:
+                    return
+                self._processor.process(self.videos[i], i, total)
+                with processed_lock:
+                    processed[0] += 1
+                    done = processed[0]
+                # Download progress owns the bar until every download finishes
+                if downloads_done.is_set():
+                    self.on_progress("process", done, total)
+
+        workers = [
+            threading.Thread(target=_process_worker, daemon=True)
+            for _ in range(n_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        completed = downloaded = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.settings.max_concurrent_downloads) as pool:
+                futures = {
+                    pool.submit(self._download_one, v, i, total): i
+                    for i, v in enumerate(self.videos)
+                }
+                for future in as_completed(futures):
+                    if self._cancelled:
+                        return False
+                    completed += 1
+                    self.on_progress("download", completed, total)
+                    i = futures[future]
+                    if self.videos[i].status == VideoStatus.DOWNLOADED:
+                        downloaded += 1
+                        work.put(i)
+        finally:
+            downloads_done.set()
+            for _ in workers:
+                work.put(None)
+            self._downloader.close()
+
+        if downloaded == 0:
+            self.on_log("✖ All downloads failed.")
+        elif downloaded < total:
+            self.on_log(f"⚠ {total - downloaded} download(s) failed — continuing with {downloaded}.")
+
+        self.on_progress("process", processed[0], total)
+        for worker in workers:
+            worker.join()
+        if self._cancelled or downloaded == 0:
+            return False
 
         ok = sum(1 for v in self.videos if v.status == VideoStatus.PROCESSED)
         if ok == 0:
@@ -186,11 +231,144 @@ class MergeEngine:
             return False
         return True
 
-    # ── Stage 3: Merge ───────────────────────────────────────
+    def _download_one(self, entry: VideoEntry, index: int, total: int) -> bool:
+        """Download one video, then warm its probe while still on the pool."""
+        ok = self._downloader.download(entry, index, total)
+        if ok and not self._cancelled:
+            self._processor.prefetch(entry)
+        return ok
+
+    def _dl_progress_relay(self, entry: VideoEntry, speed_str: str) -> None:
+        """Relay per-video speed info (called from download threads)."""
+        # This just updates the entry; GUI polls via to_dict()
+        pass
+
+    # ── FFmpeg runner ────────────────────────────────────────
 
-    def _stage_merge(self) -> bool:
+    async def _run_ffmpeg(
+        self, cmd: List[str], expected_seconds: float = 0.0, input_text: str = "",
+    ) -> subprocess.CompletedProcess:
+        """
+        Run ffmpeg with `-progress pipe:1`, streaming its output as it runs.
+
+        stdout carries ffmpeg's machine-readable key=value progress blocks,
+        which drive the merge progress bar when `expected_seconds` is known.
+        stderr is drained concurrently, keeping only the last few lines (for
+        error messages), so memory stays constant however long the encode
+        runs.  Being a coroutine, several of these can run side by side.
+        """
+        cmd = [cmd[0], "-progress", "pipe:1", "-nostats"] + cmd[1:]
+        if self._cancelled:
+            return subprocess.CompletedProcess(cmd, 1, None, "cancelled")
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if input_text else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            creationflags=NO_WINDOW,
+        )
+        self._ffmpeg_procs.add(proc)
+
+        async def _feed():
+            try:
+                proc.stdin.write(input_text.encode("utf-8"))
+                await proc.stdin.drain()
+                proc.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        tail: Deque[bytes] = deque(maxlen=20)
+
+        async def _drain_stderr():
+            async for line in proc.stderr:
+                tail.append(line)   # decoded once, at the end
+
+        total_frames = int(expected_seconds * TARGET_FPS)
+
+        async def _read_progress():
+            frame, out_us, last = 0, 0, -1
+            async for raw in proc.stdout:
+                key, _, value = raw.strip().partition(b"=")
+                if key == b"frame":
+                    frame = int(value) if value.isdigit() else 0
+                elif key == b"out_time_us":
+                    out_us = int(value) if value.isdigit() else 0
+                elif key == b"progress" and total_frames > 0:
+                    # One block ends — prefer the frame count, fall back to time
+                    done = frame or int(out_us / 1_000_000 * TARGET_FPS)
+                    done = min(done, total_frames)
+                    if done != last:
+                        last = done
+                        self.on_progress("merge", done, total_frames)
+
+        try:
+            tasks = [_drain_stderr(), _read_progress()]
+            if input_text:
+                tasks.append(_feed())
+            await asyncio.gather(*tasks)
+            await proc.wait()
+        finally:
+            self._ffmpeg_procs.discard(proc)
+        stderr = b"".join(tail).decode("utf-8", "replace").rstrip()
+        return subprocess.CompletedProcess(cmd, proc.returncode, None, stderr)
+
+    def _terminate_ffmpeg(self) -> None:
+        """Kill every running merge-stage ffmpeg (runs on the merge event loop)."""
+        for proc in list(self._ffmpeg_procs):
+            if proc.returncode is None:
+                proc.terminate()
+
+    # ── Stage 2: Merge ───────────────────────────────────────
+
+    def _resolve_music(self) -> str:
+        """Return the background music path if one is set and exists, else ""."""
+        music = self.settings.background_music
+        if not music:
+            return ""
+        if not os.path.isfile(music):
+            self.on_log(f"⚠ Background music not found, skipping: {music}")
+            return ""
+        return music
+
+    def _music_filter(self, main_audio: str, music_index: int) -> str:
+        """Filter graph fragment that loops the music track under `main_audio`."""
+        vol = self.settings.music_volume
+        return (
+            f"[{music_index}:a]aloop=loop=-1:size=2e+09,volume={vol}[bg];"
+            f"{main_audio}[bg]amix=inputs=2:duration=first:dropout_transition=3[aout]"
+        )
+
+    def _audio_args(self) -> List[str]:
+        """
+        AAC encoder arguments for merge-stage audio re-encodes.
+        Prefers libfdk_aac when compiled in; otherwise the native encoder
+        with its fast coder, which is much quicker than the default twoloop.
+        """
+        codec = self.settings.audio_encoder
+        if not codec:
+            codec = "libfdk_aac" if ffmpeg_has_encoder("libfdk_aac", self.ffmpeg) else AUDIO_CODEC
+        if codec == "libfdk_aac":
+            return ["-c:a", codec, "-vbr", "4"]
+        if codec == AUDIO_CODEC:
+            return ["-c:a", codec, "-aac_coder", "fast", "-b:a", AUDIO_BITRATE]
+        return ["-c:a", codec, "-b:a", AUDIO_BITRATE]
+
+    def _movflags(self, files: List[str]) -> List[str]:
+        """
+        MP4 muxer flags for the final output.  +faststart costs a full extra
+        read/write of the file, so it's only used while the merged result
+        (estimated from the inputs) stays under FASTSTART_MAX_BYTES.
+        """
+        if self.settings.output_format != "mp4":
+            return []
+        if self.settings.fragmented_mp4:
+            return ["-movflags", FRAGMENTED_MOVFLAGS]
+        size = sum(os.path.getsize(f) for f in files if os.path.isfile(f))
+        return ["-movflags", "+faststart"] if size <= FASTSTART_MAX_BYTES else []
+
+    async def _stage_merge(self, music: str = "") -> bool:
+        self._merge_loop = asyncio.get_running_loop()
         self.on_log("\n" + "━" * 50)
-        self.on_log("STAGE 3 / 3 — Merging")
+        self.on_log("STAGE 2 / 2 — Merging")
         self.on_log("━" * 50)
 
         ready = [
@@ -204,120 +382,309 @@ class MergeEngine:
         output = os.path.abspath(self.settings.output_path)
         os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
 
+        if music:
+            self.on_log("  🎵 Mixing background music into the merge …")
+
         if self.settings.enable_transitions:
-            ok = self._merge_xfade(ready, output)
+            merge = self._merge_xfade
         else:
-            ok = self._merge_concat(ready, output)
+            # Merged length drives the live progress bar (probes are cached)
+            total = sum(await asyncio.to_thread(probe_durations, ready, self.ffprobe))
+            merge = functools.partial(self._merge_concat, expected_seconds=total)
+        try:
+            ok = await merge(ready, output, music)
+            if not ok and music and not self._cancelled:
+                # Music is optional — a bad track must not cost the whole merge
+                self.on_log("  ⚠ Music overlay failed — merging without background music …")
+                ok = await merge(ready, output, "")
+        finally:
+            self._merge_loop = None
 
         self.on_progress("merge", 1, 1)
         return ok
 
-    def _merge_concat(self, files: List[str], output: str) -> bool:
-        """Fast merge via FFmpeg concat demuxer (no re-encoding)."""
-        if len(files) == 1:
-            shutil.copy2(files[0], output)
-            self.on_log("  → Single file copied to output.")
-            return True
-
-        self.on_log("  🔗 Fast concat (no re-encode) …")
-        list_file = os.path.join(self.cache_dir, "concat_list.txt")
-        with open(list_file, "w", encoding="utf-8") as fh:
-            for f in files:
-                safe = f.replace("\\", "/").replace("'", "'\\''")
-                fh.write(f"file '{safe}'\n")
+    async def _merge_concat(
+        self, files: List[str], output: str, music: str = "",
+        expected_seconds: float = 0.0,
+    ) -> bool:
+        """
+        Fast merge via FFmpeg concat demuxer.  Video is always stream-copied;
+        audio is only re-encoded when background music has to be mixed in.
+        """
+        movflags = self._movflags(files)
+        if len(files) == 1 and not music:
+            # Processed clips have their index at the end: a byte copy only
+            # fits when the output wants no faststart / fragmenting either.
+            # Otherwise the single-input concat below remuxes with the flags.
+            if not movflags and self.settings.output_format == "mp4":
+                await asyncio.to_thread(fast_copy, files[0], output)
+                self.on_log("  → Single file copied to output.")
+                return True
+            self.on_log("  → Remuxing single file to output …")
+        else:
+            self.on_log("  🔗 Fast concat (no video re-encode) …")
+        # The concat list goes to ffmpeg's stdin — no temp file in the cache dir.
+        # Quotes use ffmpeg's own escaping ('\'' closes, escapes, reopens).
+        concat_list = "".join(
+            "file '{}'\n".format(f.replace("\\", "/").replace("'", "'\\''"))
+            for f in files
+        )
 
         cmd = [
             self.ffmpeg, "-y", "-hide_banner", "-loglevel", "warning",
-            "-f", "concat", "-safe", "0", "-i", list_file,
-            "-c", "copy", "-movflags", "+faststart", output,
+            "-f", "concat", "-safe", "0", "-protocol_whitelist", "file,pipe",
+            "-i", "pipe:0",
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        if music:
+            cmd += [
+                "-i", music,
+                "-filter_complex", self._music_filter("[0:a]", 1),
+                "-map", "0:v", "-map", "[aout]",
+                "-c:v", "copy",
+            ]
+            cmd += self._audio_args()
+        else:
+            cmd += ["-c", "copy"]
+        cmd += movflags
+        cmd += [output]
+        result = await self._run_ffmpeg(cmd, expected_seconds, input_text=concat_list)
         if result.returncode != 0:
             self.on_log(f"  ✖ Concat failed: {result.stderr[-200:]}")
             return False
         return True
 
-    def _merge_xfade(self, files: List[str], output: str) -> bool:
-        """Merge with crossfade transitions (requires re-encoding)."""
+    async def _merge_xfade(self, files: List[str], output: str, music: str = "") -> bool:
+        """
+        Merge with crossfade transitions.
+
+        Only the short overlap around each join is re-encoded; the untouched
+        middles are stream-copied.  Falls back to re-encoding the whole
+        timeline when the clips can't be split on keyframes.
+        """
         n = len(files)
         if n == 1:
-            shutil.copy2(files[0], output)
-            return True
-
-        self.on_log(f"  🔗 Crossfade merge ({n} files, re-encoding) …")
-        fade = self.settings.fade_duration
-        durations = [get_video_duration(f, self.ffprobe) for f in files]
-
-        # Build xfade / acrossfade filter chains
-        vfilters, afilters = [], []
-        # Running offset tracks the timeline position accounting for overlaps
-        running_offset = durations[0] if durations[0] > 0 else 5.0
-
-        for i in range(1, n):
-            v_in1 = f"[{i-1}:v]" if i == 1 else f"[vf{i-1}]"
-            v_out  = f"[vf{i}]"  if i < n - 1 else "[vout]"
-            a_in1 = f"[{i-1}:a]" if i == 1 else f"[af{i-1}]"
-            a_out  = f"[af{i}]"  if i < n - 1 else "[aout]"
-
-            offset = max(running_offset - fade, 0)
-            vfilters.append(
-                f"{v_in1}[{i}:v]xfade=transition=fade:"
-                f"duration={fade}:offset={offset:.3f}{v_out}"
-            )
-            afilters.append(
-                f"{a_in1}[{i}:a]acrossfade=d={fade}:c1=tri:c2=tri{a_out}"
-            )
-            # Next offset = current offset + next clip duration - fade overlap
-            next_dur = durations[i] if i < len(durations) and durations[i] > 0 else 5.0
-            running_offset = offset + next_dur
+            return await self._merge_concat(files, output, music)
+
+        durations = await asyncio.to_thread(probe_durations, files, self.ffprobe)
+        use_cuda = self.encoder.is_gpu and ffmpeg_has_filter("xfade_cuda", self.ffmpeg)
+        if use_cuda:
+            self.on_log("  ⚡ Using xfade_cuda (frames stay on the GPU)")
+
+        plan = await asyncio.to_thread(self._plan_xfade_cuts, files, durations)
+        if plan is not None:
+            self.on_log(f"  🔗 Crossfade merge ({n} files, re-encoding joins only) …")
+            if await self._merge_xfade_segments(files, durations, plan, output, music, use_cuda):
+                return True
+            if self._cancelled:
+                return False
+            self.on_log("  ⚠ Join rendering failed, re-encoding the full timeline …")
+        else:
+            self.on_log(f"  🔗 Crossfade merge ({n} files, re-encoding) …")
 
-        cmd = [self.ffmpeg, "-y"]
-        cmd += self.encoder.hwaccel_args
-        cmd += ["-hide_banner", "-loglevel", "warning"]
-        for f in files:
-            cmd += ["-i", f]
-        cmd += [
-            "-filter_complex", ";".join(vfilters + afilters),
-            "-map", "[vout]", "-map", "[aout]",
-            "-c:v", self.encoder.codec, "-preset", self.encoder.preset,
-        ]
-        cmd += self.encoder.quality_args
-        cmd += ["-c:a", AUDIO_CODEC, "-movflags", "+faststart", output]
+        result = await self._run_xfade(files, durations, output, music, use_cuda)
+        if self._cancelled:
+            return False
+        if result.returncode != 0 and use_cuda:
+            self.on_log("  ⚠ CUDA crossfade failed, retrying on CPU …")
+            result = await self._run_xfade(files, durations, output, music, False)
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
             self.on_log(f"  ⚠ Crossfade failed, falling back to fast concat.")
             self.on_log(f"    {result.stderr[-200:]}")
-            return self._merge_concat(files, output)
+            return await self._merge_concat(files, output, music, sum(durations))
         return True
 
-    # ── Stage 4: Background Music Overlay ────────────────────
+    def _plan_xfade_cuts(
+        self, files: List[str], durations: List[float],
+    ) -> Optional[List[Tuple[float, float]]]:
+        """
+        Pick keyframe-aligned cut points for every clip.
+
+        Returns one (head_end, tail_start) pair per file: [0, head_end) goes
+        into the previous join, [tail_start, end) into the next join, and the
+        body in between is stream-copied.  None if any clip can't be split.
+        """
+        fade = self.settings.fade_duration
+        if fade <= 0:
+            return None
 
-    def _stage_music(self) -> None:
-        music = self.settings.background_music
-        if not music or not os.path.isfile(music):
-            return
+        if any(dur <= fade * 2 for dur in durations):
+            return None
 
-        output = os.path.abspath(self.settings.output_path)
-        self.on_log("\n🎵 Overlaying background music …")
-        tmp = os.path.join(self.cache_dir, "with_music.mp4")
-        vol = self.settings.music_volume
+        n = len(files)
+        plan = []
+        for i, (keyframes, dur) in enumerate(zip(probe_keyframes(files, self.ffprobe), durations)):
+            if not keyframes:
+                return None
+
+            head_end = 0.0
+            if i > 0:
+                head_end = next((k for k in keyframes if k >= fade), -1.0)
+                if head_end < 0:
+                    return None
+
+            tail_start = dur
+            if i < n - 1:
+                tail_start = max((k for k in keyframes if k <= dur - fade), default=-1.0)
+                if tail_start < head_end:
+                    return None
+
+            plan.append((head_end, tail_start))
+        return plan
+
+    async def _merge_xfade_segments(
+        self, files: List[str], durations: List[float],
+        plan: List[Tuple[float, float]], output: str, music: str, use_cuda: bool,
+    ) -> bool:
+        """
+        Copy-cut the clip bodies, render each join, then concat-copy them.
 
-        fc = (
-            f"[1:a]aloop=loop=-1:size=2e+09,volume={vol}[bg];"
-            f"[0:a][bg]amix=inputs=2:duration=first:dropout_transition=3[aout]"
-        )
+        The cuts and joins are independent of each other, so they run
+        concurrently — bounded by `_SEGMENT_JOBS` so the encoder isn't
+        oversubscribed by the joins.
+        """
+        # Private per merge: concurrent runs or a crashed run's leftovers
+        # can't collide on the segment names
+        seg_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix="xfade_")
+        limit = asyncio.Semaphore(_SEGMENT_JOBS)
+
+        async def _bounded(job) -> bool:
+            async with limit:
+                if self._cancelled:
+                    job.close()
+                    return False
+                return await job
+
+        try:
+            segments, jobs = [], []
+            for i, f in enumerate(files):
+                head_end, tail_start = plan[i]
+                if tail_start - head_end > 0.001:
+                    body = os.path.join(seg_dir, f"body_{i}.mp4")
+                    jobs.append(self._cut_copy(f, head_end, tail_start, body))
+                    segments.append(body)
+
+                if i < len(files) - 1:
+                    join = os.path.join(seg_dir, f"join_{i}.mp4")
+                    jobs.append(self._render_join(
+                        f, tail_start, durations[i],
+                        files[i + 1], plan[i + 1][0], join, use_cuda,
+                    ))
+                    segments.append(join)
+
+            results = await asyncio.gather(*(_bounded(job) for job in jobs))
+            if not all(results):
+                return False
+
+            fade = self.settings.fade_duration
+            expected = sum(durations) - fade * (len(files) - 1)
+            return await self._merge_concat(segments, output, music, expected)
+        finally:
+            shutil.rmtree(seg_dir, ignore_errors=True)
+
+    async def _cut_copy(self, src: str, start: float, end: float, out: str) -> bool:
+        """Stream-copy [start, end) of `src`; both bounds must be keyframes."""
         cmd = [
             self.ffmpeg, "-y", "-hide_banner", "-loglevel", "warning",
-            "-i", output, "-i", music,
-            "-filter_complex", fc,
-            "-map", "0:v", "-map", "[aout]",
-            "-c:v", "copy", "-c:a", AUDIO_CODEC,
-            "-shortest", tmp,
+            "-ss", f"{start:.6f}", "-i", src,
+            "-t", f"{end - start:.6f}",
+            "-map", "0:v:0", "-map", "0:a:0?",
+            "-c", "copy", "-avoid_negative_ts", "make_zero", out,
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            shutil.move(tmp, output)
-            self.on_log("  ✔ Music overlay applied.")
-        else:
-            self.on_log(f"  ⚠ Music overlay failed: {result.stderr[-150:]}")
+        result = await self._run_ffmpeg(cmd)
+        if result.returncode != 0:
+            self.on_log(f"  ✖ Segment cut failed: {result.stderr[-200:]}")
+            return False
+        return True
+
+    async def _render_join(
+        self, file_a: str, tail_start: float, dur_a: float,
+        file_b: str, head_end: float, out: str, use_cuda: bool,
+    ) -> bool:
+        """Re-encode the tail of `file_a` crossfaded into the head of `file_b`."""
+        fade = self.settings.fade_duration
+        xfade = "xfade_cuda" if use_cuda else "xfade"
+        offset = max(dur_a - tail_start - fade, 0)
+
+        global_args, input_args = self._xfade_hw_args(use_cuda)
+        cmd = [self.ffmpeg, "-y", "-hide_banner", "-loglevel", "warning"] + global_args
+        cmd += input_args + ["-ss", f"{tail_start:.6f}", "-i", file_a]
+        cmd += input_args + ["-t", f"{head_end:.6f}", "-i", file_b]
+        cmd += [
+            "-filter_complex",
+            f"[0:v][1:v]{xfade}=transition=fade:duration={fade}:offset={offset:.3f}[vout];"
+            f"[0:a][1:a]acrossfade=d={fade}:c1=tri:c2=tri[aout]",
+            "-map", "[vout]", "-map", "[aout]",
+        ]
+        # Exactly the processed clips' encoder settings, so the joins and the
+        # copied bodies concat-copy into one uniform stream
+        cmd += self._processor.codec_args
+        cmd += [out]
+        result = await self._run_ffmpeg(cmd)
+        if result.returncode != 0:
+            self.on_log(f"  ✖ Join render failed: {result.stderr[-200:]}")
+            return False
+        return True
+
+    def _xfade_hw_args(self, use_cuda: bool) -> Tuple[List[str], List[str]]:
+        """Return (global, per-input) FFmpeg args for the crossfade decoders."""
+        if use_cuda:
+            # Decode straight into VRAM so xfade_cuda → NVENC never touches system RAM
+            return (
+                ["-init_hw_device", "cuda=g:0", "-filter_hw_device", "g"],
+                ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"],
+            )
+        return [], self.encoder.hwaccel_args
+
+    async def _run_xfade(
+        self, files: List[str], durations: List[float], output: str,
+        music: str, use_cuda: bool,
+    ) -> subprocess.CompletedProcess:
+        """Build and run the full-timeline xfade / acrossfade FFmpeg command."""
+        n = len(files)
+        fade = self.settings.fade_duration
+        xfade = "xfade_cuda" if use_cuda else "xfade"
+
+        # Offset of join i = where clip i starts on the overlapped timeline,
+        # i.e. the running sum of (duration - fade) over the clips before it
+        durs = [d if d > 0 else 5.0 for d in durations]
+        offsets = [max(o, 0) for o in accumulate(d - fade for d in durs[:-1])]
+
+        def v_label(i: int) -> str:
+            return "[0:v]" if i == 0 else ("[vout]" if i == n - 1 else f"[vf{i}]")
+
+        def a_label(i: int) -> str:
+            if i == n - 1:
+                return "[amain]" if music else "[aout]"
+            return "[0:a]" if i == 0 else f"[af{i}]"
+
+        vfilters = [
+            f"{v_label(i - 1)}[{i}:v]{xfade}=transition=fade:"
+            f"duration={fade}:offset={offset:.3f}{v_label(i)}"
+            for i, offset in enumerate(offsets, start=1)
+        ]
+        afilters = [
+            f"{a_label(i - 1)}[{i}:a]acrossfade=d={fade}:c1=tri:c2=tri{a_label(i)}"
+            for i in range(1, n)
+        ]
+
+        if music:
+            # Music is the input after all clips; mix it under the crossfaded track
+            afilters.append(self._music_filter("[amain]", n))
+
+        global_args, input_args = self._xfade_hw_args(use_cuda)
+        cmd = [self.ffmpeg, "-y", "-hide_banner", "-loglevel", "warning"] + global_args
+        for f in files:
+            cmd += input_args + ["-i", f]
+        if music:
+            cmd += ["-i", music]
+        cmd += [
+            "-filter_complex", ";".join(vfilters + afilters),
+            "-map", "[vout]", "-map", "[aout]",
+        ]
+        cmd += self.encoder.video_args
+        cmd += self._audio_args()
+        cmd += self._movflags(files)
+        cmd += [output]
+
+        return await self._run_ffmpeg(cmd, sum(durations) - fade * (n - 1))
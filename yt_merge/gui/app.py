@@ -2,27 +2,34 @@
 app.py — Main application window for YT Merge Pro.
 
 Coordinates all GUI panels and drives the MergeEngine on a background thread.
-All engine callbacks are relayed to the main thread via `self.after()`.
+Engine callbacks only enqueue events; a single `after()` loop on the main
+thread drains them in batches and redraws the queue only when it changed.
 """
 
 import logging
+import queue
 import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional, Set, Tuple
 
 import customtkinter as ctk
 
 from ..config import AppSettings, detect_encoder
-from ..engine import MergeEngine
-from ..models import VideoEntry, VideoStatus
-from ..utils import parse_url_line
+from ..models import VideoEntry, VideoStatus, set_status_listener
+from ..utils import parse_url_file
 from .components import LogViewer, ProgressPanel, VideoQueuePanel
-from .playlist_dialog import PlaylistDialog
 from .settings_panel import SettingsPanel
 
+if TYPE_CHECKING:
+    from ..engine import MergeEngine
+
 logger = logging.getLogger(__name__)
 
+# Event-drain cadence (ms): snappy while the engine runs, relaxed when idle
+_DRAIN_BUSY_MS = 30
+_DRAIN_IDLE_MS = 250
+
 # ─── Theme ───────────────────────────────────────────────────
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
@@ -45,11 +52,18 @@ class App(ctk.CTk):
         self.settings = AppSettings()
         self.encoder = detect_encoder()
         self.entries: List[VideoEntry] = []
-        self.engine: Optional[MergeEngine] = None
+        self._queued: Set[Tuple[str, Optional[str], Optional[str]]] = set()   # _entry_key()s
+        self.engine: "Optional[MergeEngine]" = None
         self.is_running = False
-        self._poll_id = None
+
+        # Engine → GUI events, drained on the main thread by _drain()
+        self._event_q: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+        # Set by any entry's status change (worker threads); _drain clears it
+        self._status_changed = threading.Event()
+        set_status_listener(lambda _entry: self._status_changed.set())
 
         self._build_ui()
+        self.after(_DRAIN_IDLE_MS, self._drain)
 
     # ═════════════════════════════════════════════════════════
     #  UI Construction
@@ -171,50 +185,67 @@ class App(ctk.CTk):
     #  Queue Management
     # ═════════════════════════════════════════════════════════
 
+    @staticmethod
+    def _entry_key(e: VideoEntry) -> Tuple[str, Optional[str], Optional[str]]:
+        # The same URL with different trims is a different clip
+        return e.url, e.start_time, e.end_time
+
+    def _add_entries(self, new: Iterable[VideoEntry]) -> int:
+        """Queue every entry that isn't queued already; returns how many were added."""
+        queued, key = self._queued, self._entry_key
+        added = 0
+        for e in new:
+            k = key(e)
+            if k not in queued:
+                queued.add(k)
+                self.entries.append(e)
+                added += 1
+        return added
+
     def _add_url(self):
-        url = self.url_entry.get().strip()
+        fields = (self.url_entry, self.ts_start, self.ts_end)
+        raw = [w.get() for w in fields]
+        url, start, end = (r.strip() for r in raw)
         if not url:
             return
-        entry = VideoEntry(
-            url=url,
-            start_time=self.ts_start.get().strip() or None,
-            end_time=self.ts_end.get().strip() or None,
-        )
-        self.entries.append(entry)
-        self.url_entry.delete(0, tk.END)
-        self.ts_start.delete(0, tk.END)
-        self.ts_end.delete(0, tk.END)
+        if not self._add_entries([VideoEntry(url=url, start_time=start or None, end_time=end or None)]):
+            self._log("⚠ That clip is already in the queue.")
+        # Only clear fields that hold text — the timestamps are usually empty
+        for w, r in zip(fields, raw):
+            if r:
+                w.delete(0, tk.END)
         self._refresh_queue()
         self.url_entry.focus()
 
     def _open_playlist(self):
+        from .playlist_dialog import PlaylistDialog
         PlaylistDialog(self, self._on_playlist_import)
 
     def _on_playlist_import(self, urls: List[str]):
-        for u in urls:
-            self.entries.append(VideoEntry(url=u))
+        added = self._add_entries(VideoEntry(url=u) for u in urls)
         self._refresh_queue()
-        self._log(f"📋 Imported {len(urls)} video(s) from playlist.")
+        self._log(f"📋 Imported {added} video(s) from playlist{self._skipped(len(urls) - added)}.")
 
     def _load_txt(self):
         fp = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
         if not fp:
             return
-        count = 0
-        with open(fp, encoding="utf-8") as fh:
-            for line in fh:
-                entry = parse_url_line(line)
-                if entry:
-                    self.entries.append(entry)
-                    count += 1
+        new = parse_url_file(fp)
+        added = self._add_entries(new)
         self._refresh_queue()
-        self._log(f"📂 Loaded {count} video(s) from file.")
+        self._log(f"📂 Loaded {added} video(s) from file{self._skipped(len(new) - added)}.")
 
     def _remove_selected(self):
-        indices = self.queue_panel.selection_indices
-        for i in reversed(indices):
-            if 0 <= i < len(self.entries):
-                self.entries.pop(i)
+        indices = set(self.queue_panel.selection_indices)
+        if not indices:
+            return
+        for i in indices:
+            self._queued.discard(self._entry_key(self.entries[i]))
+        self.entries[:] = [e for i, e in enumerate(self.entries) if i not in indices]
+        # Rows are positional: the ones after the gap are rewritten in place
+        # and the surplus tail is dropped in one delete, so any surviving
+        # selection would now point at different videos.
+        self.queue_panel.clear_selection()
         self._refresh_queue()
 
     def _move_up(self):
@@ -222,7 +253,7 @@ class App(ctk.CTk):
         if indices and indices[0] > 0:
             i = indices[0]
             self.entries[i], self.entries[i - 1] = self.entries[i - 1], self.entries[i]
-            self._refresh_queue()
+            self.queue_panel.swap(i, i - 1)
             self.queue_panel.select_index(i - 1)
 
     def _move_down(self):
@@ -230,14 +261,19 @@ class App(ctk.CTk):
         if indices and indices[0] < len(self.entries) - 1:
             i = indices[0]
             self.entries[i], self.entries[i + 1] = self.entries[i + 1], self.entries[i]
-            self._refresh_queue()
+            self.queue_panel.swap(i, i + 1)
             self.queue_panel.select_index(i + 1)
 
     def _clear_all(self):
         if self.entries and messagebox.askyesno("Confirm", "Remove all videos from queue?"):
             self.entries.clear()
+            self._queued.clear()
             self._refresh_queue()
 
+    @staticmethod
+    def _skipped(n: int) -> str:
+        return f" ({n} already queued)" if n else ""
+
     def _refresh_queue(self):
         self.queue_panel.refresh(self.entries)
 
@@ -267,6 +303,8 @@ class App(ctk.CTk):
         self.log_viewer.clear()
 
         try:
+            # Deferred: the engine pulls in yt-dlp, which only a run needs
+            from ..engine import MergeEngine
             self.engine = MergeEngine(
                 settings=self.settings,
                 on_progress=self._on_progress,
@@ -279,8 +317,6 @@ class App(ctk.CTk):
             return
 
         threading.Thread(target=self._run_engine, daemon=True).start()
-        # Start polling for queue refreshes
-        self._poll_queue()
 
     def _run_engine(self):
         ok = False
@@ -288,7 +324,7 @@ class App(ctk.CTk):
             ok = self.engine.run()
         except Exception as exc:
             self._log(f"💥 {exc}")
-        self.after(0, self._on_done, ok)
+        self._event_q.put(("done", ok))
 
     def _on_done(self, success: bool):
         self.is_running = False
@@ -296,9 +332,6 @@ class App(ctk.CTk):
         self.cancel_btn.configure(state="disabled")
         self.progress_panel.set_done(success)
         self._refresh_queue()
-        if self._poll_id:
-            self.after_cancel(self._poll_id)
-            self._poll_id = None
         if success:
             messagebox.showinfo("Success", f"Saved to:\n{self.settings.output_path}")
 
@@ -311,14 +344,48 @@ class App(ctk.CTk):
 
     def _log(self, msg: str):
         """Thread-safe log append."""
-        self.after(0, self.log_viewer.append, msg)
+        self._event_q.put(("log", msg))
 
     def _on_progress(self, stage: str, current: int, total: int):
         """Thread-safe progress update."""
-        self.after(0, self.progress_panel.update_progress, stage, current, total)
-
-    def _poll_queue(self):
-        """Periodically refresh the queue view to show live status updates."""
-        if self.is_running:
+        self._event_q.put(("progress", (stage, current, total)))
+
+    # ── Event drain (main thread) ────────────────────────────
+
+    def _drain(self):
+        """
+        Apply every pending engine event in one pass.
+
+        Log lines are written as a single insert, only the latest progress
+        tuple is drawn, and the queue view is refreshed once if any entry
+        reported a status change (however many) since the last pass.
+        """
+        lines: List[str] = []
+        progress = None
+        done = None
+        while True:
+            try:
+                kind, payload = self._event_q.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "log":
+                lines.append(payload)
+            elif kind == "progress":
+                progress = payload
+            elif kind == "done":
+                done = payload
+
+        changed = self._status_changed.is_set()
+        if changed:
+            self._status_changed.clear()
+
+        if lines:
+            self.log_viewer.append_many(lines)
+        if progress:
+            self.progress_panel.update_progress(*progress)
+        if done is not None:
+            self._on_done(done)     # refreshes the queue itself
+        elif changed:
             self._refresh_queue()
-            self._poll_id = self.after(500, self._poll_queue)
+
+        self.after(_DRAIN_BUSY_MS if self.is_running else _DRAIN_IDLE_MS, self._drain)
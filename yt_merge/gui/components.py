@@ -5,11 +5,12 @@ Contains:
   • VideoQueuePanel  — Treeview list showing all queued videos with status
   • LogViewer        — Colored log output panel
   • ProgressPanel    — Overall progress bar with stage label
+  • bulk_insert      — Single-call Treeview row insertion
 """
 
 import tkinter as tk
 from tkinter import ttk
-from typing import List
+from typing import Dict, Iterable, List, Sequence
 
 import customtkinter as ctk
 
@@ -42,6 +43,22 @@ def apply_dark_treeview_style():
     style.map("Dark.Treeview.Heading", background=[("active", "#45475a")])
 
 
+# Inserts every row in one Tcl call; rows arrive as a Tcl list of value
+# lists, so titles need no manual escaping.
+_BULK_INSERT = """{tree rows first} {
+    foreach values $rows {
+        $tree insert {} end -iid $first -values $values
+        incr first
+    }
+}"""
+
+
+def bulk_insert(tree: ttk.Treeview, rows: Sequence[tuple], first: int = 0) -> None:
+    """Append `rows` to `tree` with iids str(first), str(first + 1), …"""
+    if rows:
+        tree.tk.call("apply", _BULK_INSERT, str(tree), tuple(rows), first)
+
+
 # ─── Video Queue Panel ───────────────────────────────────────
 
 class VideoQueuePanel(ctk.CTkFrame):
@@ -76,27 +93,69 @@ class VideoQueuePanel(ctk.CTkFrame):
         self.tree.configure(yscrollcommand=sb.set)
         sb.pack(side=tk.RIGHT, fill=tk.Y)
 
+        # Row iid → last display_row() pushed to Tk, so refresh() only touches changes
+        self._row_cache: Dict[str, tuple] = {}
+        self._iids: List[str] = []
+
     def refresh(self, entries: List[VideoEntry]) -> None:
-        """Rebuild the treeview from the current entries list."""
-        self.tree.delete(*self.tree.get_children())
-        for i, e in enumerate(entries):
-            d = e.to_dict()
-            self.tree.insert(
-                "", tk.END,
-                values=(i + 1, d["title"], d["start_time"], d["end_time"], d["status"]),
-            )
+        """
+        Sync the treeview with the current entries list.
+
+        Rows are keyed by position and updated in place.  Each entry's
+        cached `display_row()` tuple is compared by identity first, so an
+        unchanged row costs neither an allocation nor a Tcl call; rows are
+        inserted / deleted only when the list length changes.
+        """
+        cache = self._row_cache
+        iids = self._iids
+        known = len(iids)
+        for i, e in enumerate(entries[:known]):
+            row = e.display_row()
+            iid = iids[i]
+            prev = cache[iid]
+            if prev is row:
+                continue
+            if prev != row:
+                self.tree.item(iid, values=(i + 1,) + row)
+            cache[iid] = row
+
+        if len(entries) > known:
+            rows = [e.display_row() for e in entries[known:]]
+            bulk_insert(self.tree, [(n,) + r for n, r in enumerate(rows, known + 1)], known)
+            for i, row in enumerate(rows, known):
+                iid = str(i)
+                iids.append(iid)
+                cache[iid] = row
+
+        if len(entries) < known:
+            stale = iids[len(entries):]
+            self.tree.delete(*stale)
+            for iid in stale:
+                del cache[iid]
+            del iids[len(entries):]
+
+    def swap(self, a: int, b: int) -> None:
+        """Swap rows `a` and `b` in place (the entries list was swapped already)."""
+        cache, iids = self._row_cache, self._iids
+        ia, ib = iids[a], iids[b]
+        cache[ia], cache[ib] = cache[ib], cache[ia]
+        self.tree.item(ia, values=(a + 1,) + cache[ia])
+        self.tree.item(ib, values=(b + 1,) + cache[ib])
 
     @property
     def selection_indices(self) -> List[int]:
-        """Return sorted indices of selected rows."""
-        return sorted(self.tree.index(s) for s in self.tree.selection())
+        """Return sorted indices of selected rows (iids are the row positions)."""
+        return sorted(map(int, self.tree.selection()))
+
+    def clear_selection(self) -> None:
+        self.tree.selection_set(())
 
     def select_index(self, idx: int) -> None:
         """Select a row by its index."""
-        children = self.tree.get_children()
-        if 0 <= idx < len(children):
-            self.tree.selection_set(children[idx])
-            self.tree.see(children[idx])
+        if 0 <= idx < len(self._iids):
+            iid = self._iids[idx]
+            self.tree.selection_set(iid)
+            self.tree.see(iid)
 
 
 # ─── Log Viewer ──────────────────────────────────────────────
@@ -105,10 +164,15 @@ class LogViewer(ctk.CTkFrame):
     """
     A read-only log display with basic color-coding.
     Green for ✔/✅, red for ✖/❌/💥, yellow for ⚠, white for the rest.
+
+    Only the most recent `max_lines` lines are kept, so a long run doesn't
+    grow the underlying Tk text buffer without bound.
     """
 
-    def __init__(self, master, height: int = 140, **kwargs):
+    def __init__(self, master, height: int = 140, max_lines: int = 2000, **kwargs):
         super().__init__(master, **kwargs)
+        self.max_lines = max_lines
+        self._line_count = 0
 
         self.textbox = ctk.CTkTextbox(
             self, height=height,
@@ -124,8 +188,20 @@ class LogViewer(ctk.CTkFrame):
 
     def append(self, text: str) -> None:
         """Append a line of text to the log."""
+        self.append_many((text,))
+
+    def append_many(self, lines: Iterable[str]) -> None:
+        """Append several lines with a single insert."""
+        text = "\n".join(lines)
+        if not text:
+            return
         self.textbox.configure(state="normal")
         self.textbox.insert(tk.END, text + "\n")
+        self._line_count += text.count("\n") + 1
+        overflow = self._line_count - self.max_lines
+        if overflow > 0:
+            self.textbox.delete("1.0", f"{overflow + 1}.0")
+            self._line_count = self.max_lines
         self.textbox.see(tk.END)
         self.textbox.configure(state="disabled")
 
@@ -134,6 +210,7 @@ class LogViewer(ctk.CTkFrame):
         self.textbox.configure(state="normal")
         self.textbox.delete("1.0", tk.END)
         self.textbox.configure(state="disabled")
+        self._line_count = 0
 
 
 # ─── Progress Panel ──────────────────────────────────────────
@@ -141,13 +218,21 @@ class LogViewer(ctk.CTkFrame):
 class ProgressPanel(ctk.CTkFrame):
     """Overall progress bar with a stage label."""
 
+    # stage → (bar offset, bar span, label)
+    _STAGE_MAP = {
+        "download": (0.0,  0.45, "Downloading"),
+        "process":  (0.45, 0.35, "Processing"),
+        "merge":    (0.80, 0.15, "Merging"),
+        "done":     (0.95, 0.05, "Finalizing"),
+    }
+    # Bar moves smaller than this (fraction of full width) are not redrawn
+    _MIN_STEP = 0.005
+
     def __init__(self, master, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
 
-        self.progress_var = tk.DoubleVar(value=0.0)
         self.bar = ctk.CTkProgressBar(
-            self, variable=self.progress_var,
-            mode="determinate", height=18,
+            self, mode="determinate", height=18,
             progress_color="#a6e3a1",
             fg_color="#313244",
             corner_radius=8,
@@ -162,33 +247,36 @@ class ProgressPanel(ctk.CTkFrame):
         )
         self.label.pack(side=tk.RIGHT)
 
+        self._last_stage = None
+        self._stage = (0.0, 1.0, "")
+        self._last_pct = -1.0
+
     def update_progress(self, stage: str, current: int, total: int) -> None:
         """Update the bar and label based on pipeline stage."""
         if total <= 0:
             return
 
-        stage_map = {
-            "download": (0.0,  0.45, "Downloading"),
-            "process":  (0.45, 0.35, "Processing"),
-            "merge":    (0.80, 0.15, "Merging"),
-            "done":     (0.95, 0.05, "Finalizing"),
-        }
-        base, span, label = stage_map.get(stage, (0.0, 1.0, stage))
-        pct = base + span * (current / total)
-        pct = min(pct, 1.0)
-
-        self.progress_var.set(pct)
+        if stage != self._last_stage:
+            self._last_stage = stage
+            self._stage = self._STAGE_MAP.get(stage, (0.0, 1.0, stage))
+            self._last_pct = -1.0
+        base, span, label = self._stage
+        pct = min(base + span * (current / total), 1.0)
+        if abs(pct - self._last_pct) < self._MIN_STEP and current != total:
+            return
+        self._last_pct = pct
+
         self.bar.set(pct)
         self.label.configure(text=f"{label} {current}/{total}")
 
     def reset(self) -> None:
-        self.progress_var.set(0)
+        self._last_stage = None
+        self._last_pct = -1.0
         self.bar.set(0)
         self.label.configure(text="Ready")
 
     def set_done(self, success: bool) -> None:
         if success:
-            self.progress_var.set(1.0)
             self.bar.set(1.0)
             self.label.configure(text="Done ✅")
         else:
@@ -9,16 +9,65 @@ Features:
   • Import selected videos into main queue
 """
 
+import atexit
 import threading
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import ttk
-from typing import Callable, Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
 
 import customtkinter as ctk
-import yt_dlp
 
-from ..utils import seconds_to_timestamp
-from .components import apply_dark_treeview_style
+from ..utils import seconds_to_timestamp, watch_url
+from .components import apply_dark_treeview_style, bulk_insert
+
+if TYPE_CHECKING:
+    import yt_dlp
+
+_GLYPHS = ("☐", "☑")     # checkbox column, indexed by selection state
+
+_FLAT_OPTS = {"extract_flat": True, "quiet": True, "no_warnings": True}
+
+# Shared by every dialog so repeated fetches reuse warm worker threads
+_FETCH_POOL: Optional[ThreadPoolExecutor] = None
+_FETCH_POOL_LOCK = threading.Lock()
+
+# One YoutubeDL per pool thread — building one re-registers every extractor,
+# and a single instance must not be shared across threads.
+_YDL_LOCAL = threading.local()
+_YDL_ALL: "List[yt_dlp.YoutubeDL]" = []
+
+
+def _fetch_pool() -> ThreadPoolExecutor:
+    global _FETCH_POOL
+    with _FETCH_POOL_LOCK:
+        if _FETCH_POOL is None:
+            _FETCH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="playlist")
+        return _FETCH_POOL
+
+
+def _flat_ydl() -> "yt_dlp.YoutubeDL":
+    """Return this thread's flat-extraction YoutubeDL, creating it on first use."""
+    ydl = getattr(_YDL_LOCAL, "ydl", None)
+    if ydl is None:
+        # Imported on first fetch — yt-dlp's extractor registry is heavy
+        import yt_dlp
+        ydl = _YDL_LOCAL.ydl = yt_dlp.YoutubeDL(_FLAT_OPTS)
+        with _FETCH_POOL_LOCK:
+            _YDL_ALL.append(ydl)
+    return ydl
+
+
+@atexit.register
+def _close_ydls() -> None:
+    with _FETCH_POOL_LOCK:
+        instances = _YDL_ALL[:]
+        _YDL_ALL.clear()
+    for ydl in instances:
+        try:
+            ydl.close()
+        except Exception:
+            pass
 
 
 class PlaylistDialog(ctk.CTkToplevel):
@@ -31,6 +80,10 @@ class PlaylistDialog(ctk.CTkToplevel):
         self.minsize(640, 400)
         self.on_import = on_import
         self.videos: List[Dict] = []       # raw metadata dicts
+        self._all_iids: List[str] = []     # one row per video, attached or not
+        self._hidden: Set[str] = set()     # rows detached by the filter
+        self._selected = bytearray()       # checkbox state, one byte per video
+        self._filter_id = None             # pending debounced filter pass
         self._last_clicked: int = -1       # for shift-click range select
         self.transient(parent)
         self.grab_set()
@@ -64,7 +117,7 @@ class PlaylistDialog(ctk.CTkToplevel):
             filt, placeholder_text="type to filter by title …", height=30
         )
         self.filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=4)
-        self.filter_entry.bind("<KeyRelease>", lambda _: self._apply_filter())
+        self.filter_entry.bind("<KeyRelease>", lambda _: self._schedule_filter())
 
         # ── Treeview ─────────────────────────────────────────
         apply_dark_treeview_style()
@@ -125,46 +178,59 @@ class PlaylistDialog(ctk.CTkToplevel):
             return
         self.fetch_btn.configure(state="disabled")
         self.status_lbl.configure(text="Fetching metadata …")
-        self.tree.delete(*self.tree.get_children())
-        threading.Thread(target=self._fetch, args=(url,), daemon=True).start()
+        self._clear_tree()
+        future = _fetch_pool().submit(self._fetch, url)
+        future.add_done_callback(self._on_fetched)
 
-    def _fetch(self, url: str):
-        opts = {"extract_flat": True, "quiet": True, "no_warnings": True}
+    def _on_fetched(self, future: Future):
+        """Worker-thread completion hook — hand the result to the Tk thread."""
         try:
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                entries = info.get("entries", [info])
-
-            self.videos = []
-            for e in (entries or []):
-                if not e:
-                    continue
-                v_url = e.get("url", "")
-                if not v_url.startswith("http"):
-                    vid = e.get("id", "")
-                    if vid:
-                        v_url = f"https://www.youtube.com/watch?v={vid}"
-                    else:
-                        continue
-                title = e.get("title", "Unknown Title")
-                dur_s = e.get("duration")
-                dur = seconds_to_timestamp(dur_s) if dur_s else "Unknown"
-                self.videos.append({"url": v_url, "title": title, "dur": dur})
-
-            self.after(0, self._populate)
+            self.after_idle(self._finish_fetch, future)
+        except (RuntimeError, tk.TclError):
+            pass    # dialog closed while the fetch was running
+
+    def _finish_fetch(self, future: Future):
+        try:
+            self.videos = future.result()
         except Exception as exc:
-            self.after(
-                0,
-                lambda: [
-                    self.status_lbl.configure(text=f"Error: {str(exc)[:60]}"),
-                    self.fetch_btn.configure(state="normal"),
-                ],
-            )
+            self.status_lbl.configure(text=f"Error: {str(exc)[:60]}")
+            self.fetch_btn.configure(state="normal")
+            return
+        self._populate()
+
+    @staticmethod
+    def _fetch(url: str) -> List[Dict]:
+        """Flat-extract `url` and return one metadata dict per video."""
+        info = _flat_ydl().extract_info(url, download=False)
+        entries = info.get("entries", [info])
+
+        videos = []
+        append = videos.append
+        for e in filter(None, entries or ()):
+            v_url = watch_url(e.get("url") or "", e.get("id") or "")
+            if not v_url:
+                continue
+            title = e.get("title") or "Unknown Title"
+            dur_s = e.get("duration")
+            append({
+                "url": v_url, "title": title, "title_lc": title.lower(),
+                "dur": seconds_to_timestamp(dur_s) if dur_s else "Unknown",
+            })
+        return videos
+
+    def _clear_tree(self):
+        # Detached rows aren't children of the root, so delete by iid
+        self.tree.delete(*self._all_iids)
+        self._all_iids = []
+        self._hidden.clear()
+        self._selected = bytearray()
 
     def _populate(self):
-        self.tree.delete(*self.tree.get_children())
-        for i, v in enumerate(self.videos):
-            self.tree.insert("", tk.END, iid=str(i), values=("☐", v["title"], v["dur"]))
+        self._clear_tree()
+        self._all_iids = [str(i) for i in range(len(self.videos))]
+        self._selected = bytearray(len(self.videos))
+        bulk_insert(self.tree, [(_GLYPHS[0], v["title"], v["dur"]) for v in self.videos])
+        self._apply_filter()
         self.status_lbl.configure(text=f"Found {len(self.videos)} video(s).")
         self.fetch_btn.configure(state="normal")
         if self.videos:
@@ -172,24 +238,43 @@ class PlaylistDialog(ctk.CTkToplevel):
 
     # ── Filter ───────────────────────────────────────────────
 
+    def _schedule_filter(self):
+        """Debounce keystrokes so a burst of typing costs one filter pass."""
+        if self._filter_id is not None:
+            self.after_cancel(self._filter_id)
+        self._filter_id = self.after(120, self._apply_filter)
+
     def _apply_filter(self):
+        """Detach rows that don't match and reattach the rest, in order."""
+        self._filter_id = None
         query = self.filter_entry.get().strip().lower()
-        self.tree.delete(*self.tree.get_children())
-        for i, v in enumerate(self.videos):
-            if query and query not in v["title"].lower():
-                continue
-            self.tree.insert("", tk.END, iid=str(i), values=("☐", v["title"], v["dur"]))
+        hidden = self._hidden
+        pos = 0
+        for iid, v in zip(self._all_iids, self.videos):
+            if query and query not in v["title_lc"]:
+                if iid not in hidden:
+                    self.tree.detach(iid)
+                    hidden.add(iid)
+            else:
+                if iid in hidden:
+                    self.tree.reattach(iid, "", pos)
+                    hidden.discard(iid)
+                pos += 1
 
     # ── Selection Handling ───────────────────────────────────
 
+    def _set_checked(self, i: int, on: int):
+        """Update one row's checkbox, touching Tk only if the glyph changes."""
+        if self._selected[i] != on:
+            self._selected[i] = on
+            self.tree.set(self._all_iids[i], "sel", _GLYPHS[on])
+
     def _on_click(self, event):
         item = self.tree.identify_row(event.y)
         col = self.tree.identify_column(event.x)
         if item and col == "#1":
-            self._last_clicked = int(item)
-            vals = list(self.tree.item(item, "values"))
-            vals[0] = "☐" if vals[0] == "☑" else "☑"
-            self.tree.item(item, values=vals)
+            i = self._last_clicked = int(item)
+            self._set_checked(i, self._selected[i] ^ 1)
 
     def _on_shift_click(self, event):
         item = self.tree.identify_row(event.y)
@@ -199,30 +284,29 @@ class PlaylistDialog(ctk.CTkToplevel):
         curr = int(item)
         if self._last_clicked >= 0:
             lo, hi = sorted((self._last_clicked, curr))
-            target = self.tree.item(str(self._last_clicked), "values")[0]
-            for i in range(lo, hi + 1):
-                iid = str(i)
-                if self.tree.exists(iid):
-                    vals = list(self.tree.item(iid, "values"))
-                    vals[0] = target
-                    self.tree.item(iid, values=vals)
+            target = self._selected[self._last_clicked]
+            hidden = self._hidden
+            for i, iid in enumerate(self._all_iids[lo:hi + 1], lo):
+                if iid not in hidden:
+                    self._set_checked(i, target)
         self._last_clicked = curr
 
     def _set_all(self, state: str):
-        for item in self.tree.get_children():
-            vals = list(self.tree.item(item, "values"))
-            vals[0] = state
-            self.tree.item(item, values=vals)
+        on = int(state == _GLYPHS[1])
+        hidden = self._hidden
+        for i, iid in enumerate(self._all_iids):
+            if iid not in hidden:
+                self._set_checked(i, on)
 
     # ── Import ───────────────────────────────────────────────
 
     def _import_selected(self):
-        selected = []
-        for item in self.tree.get_children():
-            if self.tree.item(item, "values")[0] == "☑":
-                idx = int(item)
-                if 0 <= idx < len(self.videos):
-                    selected.append(self.videos[idx]["url"])
+        hidden = self._hidden
+        selected = [
+            v["url"]
+            for v, iid, on in zip(self.videos, self._all_iids, self._selected)
+            if on and iid not in hidden
+        ]
         if selected:
             self.on_import(selected)
         self.destroy()
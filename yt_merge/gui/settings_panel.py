@@ -12,6 +12,7 @@ Contains:
 
 import tkinter as tk
 from tkinter import filedialog
+from typing import Optional
 
 import customtkinter as ctk
 
@@ -21,20 +22,68 @@ from ..config import RESOLUTIONS, AppSettings
 class SettingsPanel(ctk.CTkFrame):
     """
     Settings panel that reads/writes an AppSettings instance.
-    Call `apply()` to push UI values back into the settings object.
+    Call `apply()` to push UI values back into the settings object;
+    it works whether or not the panel has been expanded yet.
     """
 
     def __init__(self, master, settings: AppSettings, encoder_label: str = "", **kwargs):
         super().__init__(master, **kwargs)
         self.settings = settings
+        self._encoder_label = encoder_label
+
+        # File dialogs are built on first use and reused afterwards, so they
+        # also reopen in the directory last browsed
+        self._save_dlg: Optional[filedialog.SaveAs] = None
+        self._music_dlg: Optional[filedialog.Open] = None
+
+        # Variables exist up front so apply() works before the rows are built
+        self.res_var = ctk.StringVar(value=settings.resolution)
+        self.fmt_var = ctk.StringVar(value=settings.output_format)
+        self.out_var = ctk.StringVar(value=settings.output_path)
+        self.fade_var = ctk.BooleanVar(value=settings.enable_transitions)
+        self.music_var = ctk.StringVar(value=settings.background_music)
+        self.vol_var = ctk.DoubleVar(value=settings.music_volume)
+
+        # ── Header: collapse toggle ──────────────────────────
+        # Starts collapsed: the rows are only built on the first expand(), so
+        # start-up pays for one button and apply() uses the variables above
+        self._body: Optional[ctk.CTkFrame] = None
+        self._toggle_btn = ctk.CTkButton(
+            self, text="▸  Settings", anchor="w", height=28,
+            font=("Segoe UI", 12, "bold"), text_color="#cdd6f4",
+            fg_color="transparent", hover_color="#313244",
+            command=self.toggle,
+        )
+        self._toggle_btn.pack(fill=tk.X, padx=8, pady=(6, 0))
+
+    # ── Expand / collapse ────────────────────────────────────
+
+    def expand(self):
+        if self._body is None:
+            self._body = self._build_rows()
+        self._body.pack(fill=tk.X)
+        self._toggle_btn.configure(text="▾  Settings")
+
+    def collapse(self):
+        if self._body is not None:
+            self._body.pack_forget()
+        self._toggle_btn.configure(text="▸  Settings")
+
+    def toggle(self):
+        if self._body is not None and self._body.winfo_manager():
+            self.collapse()
+        else:
+            self.expand()
+
+    def _build_rows(self) -> ctk.CTkFrame:
+        body = ctk.CTkFrame(self, fg_color="transparent")
 
         # ── Row 1: Resolution, Output Format, Encoder badge ──
-        r1 = ctk.CTkFrame(self, fg_color="transparent")
-        r1.pack(fill=tk.X, padx=12, pady=(10, 4))
+        r1 = ctk.CTkFrame(body, fg_color="transparent")
+        r1.pack(fill=tk.X, padx=12, pady=(4, 4))
 
         ctk.CTkLabel(r1, text="Resolution", font=("Segoe UI", 12, "bold"),
                       text_color="#cdd6f4").pack(side=tk.LEFT, padx=(0, 6))
-        self.res_var = ctk.StringVar(value=settings.resolution)
         ctk.CTkOptionMenu(
             r1, variable=self.res_var,
             values=list(RESOLUTIONS.keys()), width=100,
@@ -44,7 +93,6 @@ class SettingsPanel(ctk.CTkFrame):
 
         ctk.CTkLabel(r1, text="Format", font=("Segoe UI", 12, "bold"),
                       text_color="#cdd6f4").pack(side=tk.LEFT, padx=(20, 6))
-        self.fmt_var = ctk.StringVar(value=settings.output_format)
         ctk.CTkOptionMenu(
             r1, variable=self.fmt_var,
             values=["mp4", "mkv"], width=80,
@@ -52,6 +100,7 @@ class SettingsPanel(ctk.CTkFrame):
             dropdown_fg_color="#313244",
         ).pack(side=tk.LEFT, padx=4)
 
+        encoder_label = self._encoder_label
         if encoder_label:
             badge_color = "#a6e3a1" if "GPU" in encoder_label else "#f9e2af"
             ctk.CTkLabel(
@@ -61,12 +110,11 @@ class SettingsPanel(ctk.CTkFrame):
             ).pack(side=tk.RIGHT, padx=8)
 
         # ── Row 2: Output file path ──────────────────────────
-        r2 = ctk.CTkFrame(self, fg_color="transparent")
+        r2 = ctk.CTkFrame(body, fg_color="transparent")
         r2.pack(fill=tk.X, padx=12, pady=4)
 
         ctk.CTkLabel(r2, text="Output File", font=("Segoe UI", 12, "bold"),
                       text_color="#cdd6f4").pack(side=tk.LEFT, padx=(0, 6))
-        self.out_var = ctk.StringVar(value=settings.output_path)
         ctk.CTkEntry(r2, textvariable=self.out_var, height=32).pack(
             side=tk.LEFT, fill=tk.X, expand=True, padx=4
         )
@@ -77,10 +125,9 @@ class SettingsPanel(ctk.CTkFrame):
         ).pack(side=tk.RIGHT, padx=4)
 
         # ── Row 3: Transitions + Music ───────────────────────
-        r3 = ctk.CTkFrame(self, fg_color="transparent")
+        r3 = ctk.CTkFrame(body, fg_color="transparent")
         r3.pack(fill=tk.X, padx=12, pady=(4, 10))
 
-        self.fade_var = ctk.BooleanVar(value=settings.enable_transitions)
         ctk.CTkSwitch(
             r3, text="Fade Transitions (slower)", variable=self.fade_var,
             font=("Segoe UI", 11), text_color="#cdd6f4",
@@ -89,7 +136,6 @@ class SettingsPanel(ctk.CTkFrame):
 
         ctk.CTkLabel(r3, text="Music", font=("Segoe UI", 12, "bold"),
                       text_color="#cdd6f4").pack(side=tk.LEFT, padx=(0, 6))
-        self.music_var = ctk.StringVar(value=settings.background_music)
         ctk.CTkEntry(
             r3, textvariable=self.music_var, height=32, width=200,
             placeholder_text="optional bg music…",
@@ -101,27 +147,40 @@ class SettingsPanel(ctk.CTkFrame):
         ).pack(side=tk.LEFT, padx=4)
 
         ctk.CTkLabel(r3, text="Vol", text_color="#a6adc8").pack(side=tk.LEFT, padx=(12, 4))
-        self.vol_var = ctk.DoubleVar(value=settings.music_volume)
         ctk.CTkSlider(
             r3, from_=0, to=1, variable=self.vol_var, width=100,
             progress_color="#cba6f7", fg_color="#313244",
         ).pack(side=tk.LEFT, padx=4)
+        return body
 
     # ── Helpers ──────────────────────────────────────────────
 
+    # Button commands return at once; the modal dialog opens on the next
+    # idle pass, after the button has redrawn its released state.
+
     def _browse_output(self):
+        self.after_idle(self._show_save_dialog)
+
+    def _browse_music(self):
+        self.after_idle(self._show_music_dialog)
+
+    def _show_save_dialog(self):
         fmt = self.fmt_var.get()
-        fp = filedialog.asksaveasfilename(
+        if self._save_dlg is None:
+            self._save_dlg = filedialog.SaveAs(self)
+        fp = self._save_dlg.show(
             defaultextension=f".{fmt}",
             filetypes=[(fmt.upper(), f"*.{fmt}")],
         )
         if fp:
             self.out_var.set(fp)
 
-    def _browse_music(self):
-        fp = filedialog.askopenfilename(
-            filetypes=[("Audio Files", "*.mp3 *.wav *.aac *.ogg *.flac")],
-        )
+    def _show_music_dialog(self):
+        if self._music_dlg is None:
+            self._music_dlg = filedialog.Open(
+                self, filetypes=[("Audio Files", "*.mp3 *.wav *.aac *.ogg *.flac")],
+            )
+        fp = self._music_dlg.show()
         if fp:
             self.music_var.set(fp)
 
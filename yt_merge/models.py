@@ -4,12 +4,13 @@ models.py — Data models for the application.
 Defines:
   • VideoStatus enum for tracking each video's state
   • VideoEntry dataclass representing a single video in the queue
+  • set_status_listener() hook announcing entries whose displayed state changed
 """
 
-import threading
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Optional
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
 
 
 class VideoStatus(Enum):
@@ -27,18 +28,37 @@ class VideoStatus(Enum):
     @property
     def display(self) -> str:
         """Human-readable status label for the UI."""
-        _labels = {
-            VideoStatus.PENDING:     "Pending",
-            VideoStatus.DOWNLOADING: "Downloading...",
-            VideoStatus.DOWNLOADED:  "Downloaded",
-            VideoStatus.PROCESSING:  "Processing...",
-            VideoStatus.PROCESSED:   "Processed",
-            VideoStatus.MERGING:     "Merging...",
-            VideoStatus.DONE:        "Done",
-            VideoStatus.ERROR:       "ERROR",
-            VideoStatus.CANCELLED:   "Cancelled",
-        }
-        return _labels.get(self, self.name)
+        return _STATUS_LABELS.get(self, self.name)
+
+
+# Built once; `display` is read for every queue row the GUI rebuilds
+_STATUS_LABELS = {
+    VideoStatus.PENDING:     "Pending",
+    VideoStatus.DOWNLOADING: "Downloading...",
+    VideoStatus.DOWNLOADED:  "Downloaded",
+    VideoStatus.PROCESSING:  "Processing...",
+    VideoStatus.PROCESSED:   "Processed",
+    VideoStatus.MERGING:     "Merging...",
+    VideoStatus.DONE:        "Done",
+    VideoStatus.ERROR:       "ERROR",
+    VideoStatus.CANCELLED:   "Cancelled",
+}
+
+
+def _no_listener(entry: "VideoEntry") -> None:
+    pass
+
+
+# Called by every set_status(), on the updating (worker) thread.  A no-op
+# unless a front end installs one — the GUI uses it to learn that the queue
+# view needs a redraw instead of re-reading all entries on a timer.
+_status_listener: Callable[["VideoEntry"], None] = _no_listener
+
+
+def set_status_listener(callback: Optional[Callable[["VideoEntry"], None]]) -> None:
+    """Install the status-change callback (None removes it).  Must be thread-safe."""
+    global _status_listener
+    _status_listener = callback or _no_listener
 
 
 @dataclass
@@ -46,9 +66,15 @@ class VideoEntry:
     """
     Represents a single video in the download/merge queue.
 
-    Thread-safety: status and progress are updated from worker threads.
-    A reentrant lock guards concurrent mutations, and the GUI reads
-    snapshot copies via `to_dict()`.
+    Thread-safety: status and progress are updated from worker threads
+    without a lock — each is a single attribute store, which is atomic
+    under the CPython GIL, and only the worker currently handling an entry
+    writes to it.  The GUI reads through `to_dict()` / `display_row()`,
+    whose cached results are tagged with the `_version` they were built
+    from.  `set_status()` bumps the version after writing its fields, so a
+    result that raced with an update is simply rebuilt on the next read.
+    Workers assign metadata such as `title` before their status update,
+    so it is picked up with it.
     """
     url: str
     start_time: Optional[str] = None
@@ -59,6 +85,7 @@ class VideoEntry:
     video_id:   str   = ""
     duration:   float = 0.0
     thumbnail_url: str = ""
+    has_audio:  Optional[bool] = None    # from yt-dlp metadata; None = unknown
 
     # File paths through the pipeline
     downloaded_path: str = ""
@@ -69,32 +96,65 @@ class VideoEntry:
     progress: float = 0.0        # 0.0 – 1.0 within current stage
     error_msg: str  = ""
 
-    # Internal lock for thread-safe updates
-    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    # Read-side caches, keyed on the state they were built from
+    _version: int = field(default=0, repr=False, compare=False)
+    _snapshot: Optional[tuple] = field(default=None, repr=False, compare=False)
+    _row: Optional[tuple] = field(default=None, repr=False, compare=False)
 
     def set_status(self, status: VideoStatus, error: str = "") -> None:
-        """Thread-safe status update."""
-        with self._lock:
-            self.status = status
-            if error:
-                self.error_msg = error
-            if status in (VideoStatus.DOWNLOADED, VideoStatus.PROCESSED, VideoStatus.DONE):
-                self.progress = 1.0
+        """Status update (safe to call from worker threads)."""
+        self.status = status
+        if error:
+            self.error_msg = error
+        if status in (VideoStatus.DOWNLOADED, VideoStatus.PROCESSED, VideoStatus.DONE):
+            self.progress = 1.0
+        self._version += 1
+        _status_listener(self)
 
     def set_progress(self, value: float) -> None:
-        """Thread-safe progress update (clamped to 0–1)."""
-        with self._lock:
-            self.progress = max(0.0, min(1.0, value))
-
-    def to_dict(self) -> dict:
-        """Return a snapshot of display-relevant fields (safe to read from GUI thread)."""
-        with self._lock:
-            return {
-                "url": self.url,
-                "title": self.title or self.url,
-                "start_time": self.start_time or "–",
-                "end_time": self.end_time or "–",
-                "status": self.status.display,
-                "progress": self.progress,
-                "error_msg": self.error_msg,
-            }
+        """Progress update, clamped to 0–1 (safe to call from worker threads)."""
+        self.progress = 0.0 if value < 0.0 else 1.0 if value > 1.0 else value
+
+    def to_dict(self) -> Mapping[str, object]:
+        """
+        Return a snapshot of display-relevant fields (safe to read from GUI thread).
+
+        The snapshot is a read-only view of a cached dict, so repeated
+        calls share it instead of copying.
+        """
+        key = (self._version, self.progress)
+        cached = self._snapshot
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        snap = MappingProxyType({
+            "url": self.url,
+            "title": self.title or self.url,
+            "start_time": self.start_time or "–",
+            "end_time": self.end_time or "–",
+            "status": self.status.display,
+            "progress": key[1],
+            "error_msg": self.error_msg,
+        })
+        self._snapshot = (key, snap)
+        return snap
+
+    def display_row(self) -> tuple:
+        """
+        Return the queue-view columns (title, start, end, status).
+
+        The tuple is cached until the next `set_status()`, so while nothing
+        changes callers get the very same object back and can skip the
+        row with an identity check.  Progress ticks don't invalidate it.
+        """
+        version = self._version
+        cached = self._row
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        row = (
+            self.title or self.url,
+            self.start_time or "–",
+            self.end_time or "–",
+            self.status.display,
+        )
+        self._row = (version, row)
+        return row
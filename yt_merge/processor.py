@@ -3,26 +3,75 @@ processor.py — FFmpeg video processing (trim, scale, normalize).
 
 Handles:
   • Trimming to start/end timestamps
-  • Scaling + padding to target resolution (preserves aspect ratio)
+  • Scaling + padding to target resolution (preserves aspect ratio),
+    on the GPU when NVENC and the CUDA scale/pad filters are available
   • FPS normalization
   • Silent audio generation for videos without audio
-  • Cache-aware: skips if processed file already exists
+  • Cache-aware: skips if processed file already exists (clips are encoded
+    under a ".part" name, so an interrupted encode never looks cached)
+  • Live per-clip progress and prompt cancellation of the running encodes
+  • Thread-safe: several clips may be processed concurrently
 """
 
+import functools
+import hashlib
 import logging
 import os
 import subprocess
-from typing import Optional, Callable
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional, Set
 
 from .config import (
-    AppSettings, EncoderProfile, TARGET_FPS,
+    AppSettings, EncoderProfile, NO_WINDOW, TARGET_FPS,
     AUDIO_CODEC, AUDIO_BITRATE, AUDIO_SAMPLE_RATE, AUDIO_CHANNELS,
 )
 from .models import VideoEntry, VideoStatus
-from .utils import timestamp_to_seconds, has_audio_stream
+from .utils import (
+    ffmpeg_has_filter, file_stat, has_audio_stream, timestamp_to_seconds,
+)
 
 logger = logging.getLogger(__name__)
 
+PROCESS_TIMEOUT = 600   # seconds per clip
+
+# Constant argv pieces, formatted once instead of per command
+_ANULL = f"anullsrc=channel_layout=stereo:sample_rate={AUDIO_SAMPLE_RATE}"
+_AUDIO_ARGS = (
+    "-c:a", AUDIO_CODEC,
+    "-b:a", AUDIO_BITRATE,
+    "-ar",  str(AUDIO_SAMPLE_RATE),
+    "-ac",  str(AUDIO_CHANNELS),
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _vf_for(tw: int, th: int, fps: int, gpu: bool) -> str:
+    """The scale / pad / fps filter chain for one target (one per batch)."""
+    if gpu:
+        # nv12 out: 10-bit sources decode to p010, which h264_nvenc rejects
+        return (
+            f"scale_cuda={tw}:{th}:force_original_aspect_ratio=decrease:format=nv12,"
+            f"pad_cuda={tw}:{th}:(ow-iw)/2:(oh-ih)/2:black,"
+            f"setsar=1,fps={fps}"
+        )
+    return (
+        f"scale={tw}:{th}:force_original_aspect_ratio=decrease,"
+        f"pad={tw}:{th}:(ow-iw)/2:(oh-ih)/2:black,"
+        f"setsar=1,fps={fps}"
+    )
+
+
+def encode_workers(encoder: EncoderProfile) -> int:
+    """
+    How many clips to encode at once.  Consumer GPUs cap concurrent NVENC
+    sessions, so 2 there; x264 already threads each encode, so CPU runs
+    get a few parallel clips on larger machines only.
+    """
+    if encoder.is_gpu:
+        return 2
+    return max(1, (os.cpu_count() or 1) // 4)
+
 
 class VideoProcessor:
     """Process a downloaded video to a standardized format for merging."""
@@ -41,11 +90,31 @@ class VideoProcessor:
         self.ffmpeg = ffmpeg
         self.ffprobe = ffprobe
         self.cache_dir = cache_dir
+        self._out_prefix = os.path.join(cache_dir, "proc_")
+        # Cached clips are keyed on the encode settings too: only clips with
+        # identical stream parameters may be concat-copied together
+        profile = "|".join([encoder.signature, *_AUDIO_ARGS, str(TARGET_FPS)])
+        self._out_tag = hashlib.sha1(profile.encode("utf-8")).hexdigest()[:8]
+        # Leading argv shared by every encode; _build_command copies it
+        self._base_cmd = [
+            ffmpeg, "-y", "-hide_banner", "-loglevel", "warning", *encoder.hwaccel_args,
+        ]
         self.on_log = on_log or logger.info
         self._cancelled = False
+        self._procs: Set[subprocess.Popen] = set()
+        # Keep decoded frames in VRAM through scale/pad so NVENC reads them
+        # directly, instead of a download → CPU filters → upload round trip
+        self._gpu_filters = (
+            encoder.codec.endswith("_nvenc")
+            and ffmpeg_has_filter("scale_cuda", ffmpeg)
+            and ffmpeg_has_filter("pad_cuda", ffmpeg)
+        )
 
     def cancel(self) -> None:
         self._cancelled = True
+        for proc in list(self._procs):
+            if proc.poll() is None:
+                proc.terminate()
 
     def process(self, entry: VideoEntry, index: int, total: int) -> bool:
         """
@@ -56,37 +125,53 @@ class VideoProcessor:
             entry.set_status(VideoStatus.CANCELLED)
             return False
 
-        if not entry.downloaded_path or not os.path.isfile(entry.downloaded_path):
-            entry.set_status(VideoStatus.ERROR, error="Source file missing")
-            return False
-
         # ── Cache check ──────────────────────────────────────
-        res_h = self.settings.resolution_height
-        out_path = os.path.join(
-            self.cache_dir, f"proc_{entry.video_id}_{res_h}.mp4"
-        )
-        if os.path.isfile(out_path):
+        # Before the source check: a hit costs one stat and needs no source
+        out_path = self._output_path(entry)
+        if file_stat(out_path):
             entry.processed_path = out_path
             entry.set_status(VideoStatus.PROCESSED)
             self.on_log(f"⚡ [{index+1}/{total}] Cache hit: {entry.title}")
             return True
 
+        if not entry.downloaded_path or not file_stat(entry.downloaded_path):
+            entry.set_status(VideoStatus.ERROR, error="Source file missing")
+            return False
+
         # ── Build FFmpeg command ─────────────────────────────
         entry.set_status(VideoStatus.PROCESSING)
         entry.set_progress(0.0)
         self.on_log(f"⚙  [{index+1}/{total}] Processing: {entry.title}")
 
         tw, th = self.settings.resolution_wh
-        cmd = self._build_command(entry, tw, th, out_path)
+        expected = self._expected_seconds(entry)
+        part_path = out_path + ".part"
+        done = False
 
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=600
-            )
-            if result.returncode != 0:
-                stderr_tail = result.stderr[-400:] if result.stderr else "unknown"
-                raise RuntimeError(f"FFmpeg exit code {result.returncode}: {stderr_tail}")
+            # GPU graph first, CPU graph as the fallback if it fails (e.g. a
+            # codec the GPU can't decode yields CPU frames scale_cuda rejects)
+            attempts = []
+            if self._gpu_filters:
+                attempts.append(self._build_command(entry, tw, th, part_path, True))
+            attempts.append(self._build_command(entry, tw, th, part_path, False))
+
+            for i, cmd in enumerate(attempts):
+                if i:
+                    self.on_log("  ⚠ GPU filter path failed — retrying with CPU filters")
+                    entry.set_progress(0.0)
+                returncode, stderr = self._run_ffmpeg(cmd, entry, expected)
+                if returncode == 0 or self._cancelled:
+                    break
+            if self._cancelled:
+                entry.set_status(VideoStatus.CANCELLED)
+                return False
+            if returncode != 0:
+                stderr_tail = stderr[-400:] if stderr else "unknown"
+                raise RuntimeError(f"FFmpeg exit code {returncode}: {stderr_tail}")
 
+            os.replace(part_path, out_path)
+            done = True
             entry.processed_path = out_path
             entry.set_status(VideoStatus.PROCESSED)
             self.on_log(f"  ✔ Processed: {entry.title}")
@@ -100,15 +185,105 @@ class VideoProcessor:
             entry.set_status(VideoStatus.ERROR, error=str(exc)[:120])
             self.on_log(f"  ✖ Process failed: {exc}")
             return False
+        finally:
+            if not done:
+                # Cancelled, timed out or failed: drop the truncated clip
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+
+    def prefetch(self, entry: VideoEntry) -> None:
+        """
+        Resolve the clip's audio probe ahead of `process()`.
+
+        Safe to call from any thread — the engine calls it on the download
+        workers, so ffprobe runs there in parallel instead of serially in
+        front of each encode.  A no-op when yt-dlp already reported the
+        audio codec or the processed clip is cached.
+        """
+        if entry.has_audio is not None or file_stat(self._output_path(entry)):
+            return
+        entry.has_audio = has_audio_stream(entry.downloaded_path, self.ffprobe)
+
+    @property
+    def codec_args(self) -> List[str]:
+        """Video + audio encoder arguments every processed clip is written with."""
+        return self.encoder.video_args + list(_AUDIO_ARGS)
+
+    def _output_path(self, entry: VideoEntry) -> str:
+        res_h = self.settings.resolution_height
+        return f"{self._out_prefix}{entry.video_id}_{res_h}_{self._out_tag}.mp4"
+
+    # ── FFmpeg runner ────────────────────────────────────────
+
+    @staticmethod
+    def _expected_seconds(entry: VideoEntry) -> float:
+        """Length of the output clip, or 0.0 if unknown."""
+        start = timestamp_to_seconds(entry.start_time) if entry.start_time else 0.0
+        if entry.end_time:
+            dur = timestamp_to_seconds(entry.end_time) - start
+            if dur > 0:
+                return dur
+        return max(entry.duration - start, 0.0)
+
+    def _run_ffmpeg(self, cmd: list, entry: VideoEntry, expected_seconds: float):
+        """
+        Run one encode, feeding `-progress` output into `entry.set_progress`.
+
+        stderr is drained on a helper thread into a short ring buffer of raw
+        lines, so a chatty encode can't grow memory, and only the kept tail
+        is ever decoded.  Returns (returncode, stderr tail);
+        raises subprocess.TimeoutExpired after PROCESS_TIMEOUT seconds.
+        """
+        cmd = [cmd[0], "-progress", "pipe:1", "-nostats"] + cmd[1:]
+        proc = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=NO_WINDOW,
+        )
+        self._procs.add(proc)
+        if self._cancelled:     # cancel() may have run before proc was registered
+            proc.terminate()
+
+        tail: Deque[bytes] = deque(maxlen=20)
+        reader = threading.Thread(target=lambda: tail.extend(proc.stderr), daemon=True)
+        reader.start()
+        timed_out = threading.Event()
+
+        def _kill():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(PROCESS_TIMEOUT, _kill)
+        timer.daemon = True
+        timer.start()
+
+        try:
+            total_us = expected_seconds * 1_000_000
+            for line in proc.stdout:
+                key, _, value = line.partition(b"=")
+                if key == b"out_time_us" and total_us > 0:
+                    value = value.strip()
+                    if value.isdigit():
+                        entry.set_progress(int(value) / total_us)
+            proc.wait()
+            reader.join()
+        finally:
+            timer.cancel()
+            self._procs.discard(proc)
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, PROCESS_TIMEOUT)
+        return proc.returncode, b"".join(tail).decode("utf-8", "replace").rstrip()
 
     # ── Command builder ──────────────────────────────────────
 
     def _build_command(
-        self, entry: VideoEntry, tw: int, th: int, out_path: str
+        self, entry: VideoEntry, tw: int, th: int, out_path: str, gpu_filters: bool = False,
     ) -> list:
-        cmd = [self.ffmpeg, "-y"]
-        cmd += self.encoder.hwaccel_args
-        cmd += ["-hide_banner", "-loglevel", "warning"]
+        cmd = self._base_cmd.copy()
+        if gpu_filters:
+            cmd += ["-hwaccel_output_format", "cuda"]
 
         # Seek to start time (before -i for fast seek)
         start_sec = 0.0
@@ -118,13 +293,13 @@ class VideoProcessor:
 
         cmd += ["-i", entry.downloaded_path]
 
-        # Check for audio and add silent audio if missing
-        audio_present = has_audio_stream(entry.downloaded_path, self.ffprobe)
+        # Add silent audio if the source has none.  yt-dlp's metadata
+        # usually says already; only probe the file when it didn't.
+        audio_present = entry.has_audio
+        if audio_present is None:
+            audio_present = has_audio_stream(entry.downloaded_path, self.ffprobe)
         if not audio_present:
-            cmd += [
-                "-f", "lavfi", "-i",
-                f"anullsrc=channel_layout=stereo:sample_rate={AUDIO_SAMPLE_RATE}"
-            ]
+            cmd += ["-f", "lavfi", "-i", _ANULL]
 
         # Duration (end_time - start_time)
         if entry.end_time:
@@ -134,28 +309,19 @@ class VideoProcessor:
                 cmd += ["-t", str(dur)]
 
         # ── Video filters ────────────────────────────────────
-        vf = (
-            f"scale={tw}:{th}:force_original_aspect_ratio=decrease,"
-            f"pad={tw}:{th}:(ow-iw)/2:(oh-ih)/2:black,"
-            f"setsar=1,fps={TARGET_FPS}"
-        )
-        cmd += ["-vf", vf]
+        cmd += ["-vf", _vf_for(tw, th, TARGET_FPS, gpu_filters)]
 
         # ── Encoder settings ─────────────────────────────────
-        cmd += ["-c:v", self.encoder.codec, "-preset", self.encoder.preset]
-        cmd += self.encoder.quality_args
+        cmd += self.encoder.video_args
 
         # ── Audio settings ───────────────────────────────────
-        cmd += [
-            "-c:a", AUDIO_CODEC,
-            "-b:a", AUDIO_BITRATE,
-            "-ar",  str(AUDIO_SAMPLE_RATE),
-            "-ac",  str(AUDIO_CHANNELS),
-        ]
+        cmd += _AUDIO_ARGS
 
         # ── Stream mapping for silent audio ──────────────────
         if not audio_present:
             cmd += ["-map", "0:v:0", "-map", "1:a:0", "-shortest"]
 
-        cmd += ["-movflags", "+faststart", out_path]
+        # Cached intermediates are only read locally by the merge, so skip
+        # +faststart's extra rewrite pass.  -f: out_path may be a ".part" name
+        cmd += ["-f", "mp4", out_path]
         return cmd
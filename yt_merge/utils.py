@@ -3,20 +3,25 @@ utils.py — Shared utility functions.
 
 Covers:
   • Timestamp ↔ seconds conversion
-  • Filename sanitization
-  • FFmpeg / ffprobe binary discovery
-  • FFprobe helpers (duration, audio stream detection)
-  • URL validation and text-file line parsing
+  • Filename sanitization and fast file copies
+  • FFmpeg / ffprobe binary discovery and filter / encoder probing
+  • FFprobe helpers (cached duration / audio probe, keyframes)
+  • URL validation, video-id extraction and batch text-file parsing
 """
 
+import functools
 import json
 import logging
 import os
 import re
 import shutil
+import stat
 import subprocess
-from typing import Optional, Tuple
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
 
+from .config import NO_WINDOW
 from .models import VideoEntry
 
 logger = logging.getLogger(__name__)
@@ -24,6 +29,10 @@ logger = logging.getLogger(__name__)
 
 # ─── Timestamp Helpers ────────────────────────────────────────
 
+# [[H:]M:]S[.fff] — the optional hours group only matches when minutes follow
+_TS_RE = re.compile(r"(?:(?:(\d+):)?(\d+):)?(\d+(?:\.\d*)?|\.\d+)")
+
+
 def timestamp_to_seconds(ts: str) -> float:
     """
     Convert a timestamp string to seconds.
@@ -34,19 +43,15 @@ def timestamp_to_seconds(ts: str) -> float:
         return 0.0
     ts = ts.strip()
 
-    # Direct numeric value
+    m = _TS_RE.fullmatch(ts)
+    if m:
+        h, mn, sec = m.groups()
+        return (int(h) * 3600 if h else 0) + (int(mn) * 60 if mn else 0) + float(sec)
+
+    # Anything else float() understands (e.g. "1e2")
     try:
         return float(ts)
     except ValueError:
-        pass
-
-    parts = ts.split(":")
-    try:
-        if len(parts) == 3:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
-        if len(parts) == 2:
-            return int(parts[0]) * 60 + float(parts[1])
-    except (ValueError, IndexError):
         logger.warning("Could not parse timestamp: %s", ts)
     return 0.0
 
@@ -55,25 +60,67 @@ def seconds_to_timestamp(s: float) -> str:
     """Convert seconds to HH:MM:SS.mmm format."""
     if s <= 0:
         return "00:00:00.000"
-    h = int(s // 3600)
-    m = int((s % 3600) // 60)
-    sec = s % 60
-    return f"{h:02d}:{m:02d}:{sec:06.3f}"
+    # Whole milliseconds + integer divmod: one rounding step, so values
+    # like 59.9996 carry into the minute instead of printing "60.000".
+    h, rem = divmod(round(s * 1000), 3_600_000)
+    m, rem = divmod(rem, 60_000)
+    sec, ms = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{sec:02d}.{ms:03d}"
 
 
 # ─── Filename / Path Helpers ─────────────────────────────────
 
+# Characters illegal in Windows/Linux filenames, plus ASCII control chars
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*' + "".join(map(chr, range(32))), "_"))
+
+
 def sanitize_filename(name: str) -> str:
     """Strip illegal characters and clamp length for Windows/Linux FS."""
-    cleaned = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', name).strip()
+    cleaned = name.translate(_SANITIZE_TABLE).strip()
     return cleaned[:150] if cleaned else "untitled"
 
 
+def file_stat(path: str) -> Optional[os.stat_result]:
+    """
+    One stat() call: the result if `path` is an existing regular file,
+    else None.  Lets callers reuse it (e.g. for probe_file) instead of
+    pairing os.path.isfile with a second stat.
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def fast_copy(src: str, dst: str) -> None:
+    """
+    Copy a (possibly multi-GB) file as cheaply as the filesystem allows.
+
+    On Linux, `cp --reflink=auto` clones extents on Btrfs/XFS (an O(1)
+    metadata op) and degrades to a normal copy elsewhere.  Otherwise
+    shutil.copy2, which already uses sendfile / fcopyfile in the kernel.
+    Hardlinks are deliberately avoided: the output would alias the cached
+    clip, and a later `ffmpeg -y` onto the same path would truncate both.
+    """
+    if sys.platform.startswith("linux") and shutil.which("cp"):
+        try:
+            subprocess.run(
+                ["cp", "--reflink=auto", "--preserve=timestamps", src, dst],
+                check=True, capture_output=True, timeout=600,
+            )
+            return
+        except (subprocess.SubprocessError, OSError) as exc:
+            logger.debug("Reflink copy failed (%s) — using shutil", exc)
+    shutil.copy2(src, dst)
+
+
 # ─── FFmpeg / FFprobe Discovery ──────────────────────────────
 
+@functools.lru_cache(maxsize=1)
 def find_ffmpeg() -> Tuple[str, str]:
     """
-    Locate ffmpeg and ffprobe on PATH.
+    Locate ffmpeg and ffprobe on PATH (cached once found).
     Raises FileNotFoundError with a user-friendly message if missing.
     """
     ffmpeg = shutil.which("ffmpeg")
@@ -101,31 +148,144 @@ def find_ffmpeg() -> Tuple[str, str]:
     return ffmpeg, ffprobe
 
 
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_listing(ffmpeg: str, kind: str) -> frozenset:
+    """
+    Names from `ffmpeg -filters` / `ffmpeg -encoders` (cached per binary).
+    Both list one component per line as "<flags> <name> ...".
+    """
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-hide_banner", f"-{kind}"],
+            capture_output=True, text=True, check=True, timeout=15,
+            creationflags=NO_WINDOW,
+        )
+    except Exception as exc:
+        logger.warning("Could not list ffmpeg %s: %s", kind, exc)
+        return frozenset()
+    return frozenset(
+        parts[1] for parts in (line.split() for line in result.stdout.splitlines())
+        if len(parts) >= 3 and parts[1] != "="
+    )
+
+
+def ffmpeg_has_filter(name: str, ffmpeg: str = "ffmpeg") -> bool:
+    """Check whether ffmpeg was built with the named filter."""
+    return name in _ffmpeg_listing(ffmpeg, "filters")
+
+
+def ffmpeg_has_encoder(name: str, ffmpeg: str = "ffmpeg") -> bool:
+    """Check whether ffmpeg was built with the named encoder."""
+    return name in _ffmpeg_listing(ffmpeg, "encoders")
+
+
 # ─── FFprobe Helpers ─────────────────────────────────────────
 
+class MediaInfo(NamedTuple):
+    """What the pipeline needs to know about a media file."""
+    duration: float
+    has_audio: bool
+
+
+@functools.lru_cache(maxsize=512)
+def _probe_cached(filepath: str, mtime_ns: int, size: int, ffprobe: str) -> MediaInfo:
+    # mtime / size are only part of the key: a rewritten file misses the cache.
+    # Failures raise, and lru_cache doesn't store exceptions.
+    cmd = [
+        ffprobe, "-v", "quiet", "-print_format", "json",
+        "-show_entries", "format=duration:stream=codec_type", filepath,
+    ]
+    result = subprocess.run(
+        cmd, capture_output=True, text=True, check=True, timeout=30, creationflags=NO_WINDOW,
+    )
+    data = json.loads(result.stdout)
+    return MediaInfo(
+        duration=float(data.get("format", {}).get("duration") or 0.0),
+        has_audio=any(st.get("codec_type") == "audio" for st in data.get("streams", [])),
+    )
+
+
+def probe_file(
+    filepath: str, ffprobe: str = "ffprobe", st: Optional[os.stat_result] = None,
+) -> MediaInfo:
+    """
+    Duration and audio presence from a single ffprobe run.
+    Results are cached per (path, mtime, size), so repeat probes of an
+    unchanged file don't spawn ffprobe again; pass `st` if the file was
+    just stat()ed.  Raises on failure.
+    """
+    if st is None:
+        st = os.stat(filepath)
+    return _probe_cached(filepath, st.st_mtime_ns, st.st_size, ffprobe)
+
+
 def get_video_duration(filepath: str, ffprobe: str = "ffprobe") -> float:
     """Return the duration of a media file in seconds (0.0 on failure)."""
-    cmd = [ffprobe, "-v", "quiet", "-print_format", "json", "-show_format", filepath]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=30)
-        return float(json.loads(result.stdout)["format"]["duration"])
+        return probe_file(filepath, ffprobe).duration
     except Exception as exc:
         logger.warning("Could not probe duration of %s: %s", filepath, exc)
         return 0.0
 
 
-def has_audio_stream(filepath: str, ffprobe: str = "ffprobe") -> bool:
-    """Check whether the file contains at least one audio stream."""
+def probe_durations(paths: List[str], ffprobe: str = "ffprobe") -> List[float]:
+    """
+    Probe the durations of several files at once (same order as `paths`).
+    ffprobe runs are dominated by process start-up, so they are overlapped
+    on a small thread pool rather than issued one after another.
+    """
+    if len(paths) <= 1:
+        return [get_video_duration(p, ffprobe) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+        return list(pool.map(lambda p: get_video_duration(p, ffprobe), paths))
+
+
+def get_keyframe_times(filepath: str, ffprobe: str = "ffprobe") -> List[float]:
+    """
+    Return the sorted timestamps (seconds) of video keyframes.
+    Reads packet flags only, so no frames are decoded.  Empty list on failure.
+    """
     cmd = [
         ffprobe, "-v", "quiet",
-        "-select_streams", "a:0",
-        "-show_entries", "stream=codec_type",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
         "-of", "csv=p=0",
         filepath,
     ]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=15)
-        return "audio" in result.stdout.lower()
+        result = subprocess.run(
+            cmd, capture_output=True, text=True, check=True, timeout=60,
+            creationflags=NO_WINDOW,
+        )
+    except Exception as exc:
+        logger.warning("Could not probe keyframes of %s: %s", filepath, exc)
+        return []
+    times = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags:
+            try:
+                times.append(float(pts))
+            except ValueError:
+                continue
+    return sorted(times)
+
+
+def probe_keyframes(paths: List[str], ffprobe: str = "ffprobe") -> List[List[float]]:
+    """
+    Keyframe times of several files (same order as `paths`).  Each scan
+    reads a whole clip's packets, so they run side by side on a small pool.
+    """
+    if len(paths) <= 1:
+        return [get_keyframe_times(p, ffprobe) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+        return list(pool.map(lambda p: get_keyframe_times(p, ffprobe), paths))
+
+
+def has_audio_stream(filepath: str, ffprobe: str = "ffprobe") -> bool:
+    """Check whether the file contains at least one audio stream."""
+    try:
+        return probe_file(filepath, ffprobe).has_audio
     except Exception:
         return False
 
@@ -133,15 +293,46 @@ def has_audio_stream(filepath: str, ffprobe: str = "ffprobe") -> bool:
 # ─── URL Validation & Parsing ────────────────────────────────
 
 _YT_URL_RE = re.compile(
-    r"(https?://)?(www\.)?"
-    r"(youtube\.com/(watch\?v=|shorts/|embed/)|youtu\.be/)"
-    r"[\w-]+"
+    r"(?:https?://)?(?:www\.)?"
+    r"(?:youtube\.com/(?:watch\?v=|shorts/|embed/)|youtu\.be/)"
+    r"[\w-]+",
+    re.ASCII,
 )
 
 
 def validate_youtube_url(url: str) -> bool:
     """Basic check that a string looks like a YouTube video URL."""
-    return bool(_YT_URL_RE.search(url))
+    # Every accepted form contains "youtu"; a substring test rejects
+    # everything else without running the regex at all.
+    return "youtu" in url and _YT_URL_RE.search(url) is not None
+
+
+_VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/|shorts/|embed/)([A-Za-z0-9_-]{11})")
+
+
+def extract_video_id(url: str) -> str:
+    """Pull the 11-character video id out of a YouTube URL ("" if absent)."""
+    m = _VIDEO_ID_RE.search(url)
+    return m.group(1) if m else ""
+
+
+_WATCH_URL = "https://www.youtube.com/watch?v="
+
+
+def watch_url(url: str, video_id: str = "") -> str:
+    """
+    Normalize a (possibly relative) entry URL to an absolute one.
+
+    Absolute http(s) URLs are returned as-is; otherwise the watch URL is
+    built from `video_id`.  Returns "" when neither is usable.
+    """
+    if url.startswith("http"):
+        return url
+    return _WATCH_URL + video_id if video_id else ""
+
+
+_FIELD_SPLIT_RE = re.compile(r"[\s,]+")
+_HAS_SPACE_RE = re.compile(r"\s")
 
 
 def parse_url_line(line: str) -> Optional[VideoEntry]:
@@ -161,14 +352,46 @@ def parse_url_line(line: str) -> Optional[VideoEntry]:
     if not line or line.startswith("#"):
         return None
 
+    if not line.startswith("http"):
+        return None
+    # Fast path: a bare URL (the common case) needs no splitting
+    if "," not in line and not _HAS_SPACE_RE.search(line):
+        return VideoEntry(url=line)
+
     # Split on whitespace or commas
-    parts = re.split(r"[\s,]+", line, maxsplit=2)
+    parts = _FIELD_SPLIT_RE.split(line, maxsplit=2)
     url = parts[0]
 
-    if not url.startswith("http"):
-        return None
-
     start = parts[1] if len(parts) > 1 else None
     end   = parts[2] if len(parts) > 2 else None
 
     return VideoEntry(url=url, start_time=start, end_time=end)
+
+
+# Whole-file form of parse_url_line: URL, then up to two fields split on
+# spaces / tabs / commas, the last one taking the rest of the line.
+_URL_LINE_RE = re.compile(
+    r"^[^\S\n]*(http[^\s,]*)"
+    r"(?:(?:[^\S\n]|,)+([^\s,]+))?"
+    r"(?:(?:[^\S\n]|,)+([^\n]*?))?[^\S\n]*$",
+    re.MULTILINE,
+)
+
+
+def parse_url_text(text: str) -> List[VideoEntry]:
+    """
+    Parse a whole batch file in one regex scan.
+
+    Accepts the same line formats as `parse_url_line`; blank, comment and
+    non-URL lines are skipped.
+    """
+    return [
+        VideoEntry(url=url, start_time=start or None, end_time=end or None)
+        for url, start, end in _URL_LINE_RE.findall(text)
+    ]
+
+
+def parse_url_file(path: str) -> List[VideoEntry]:
+    """Read a batch .txt file in one go and parse it (see `parse_url_text`)."""
+    with open(path, encoding="utf-8", errors="replace", buffering=1 << 20) as fh:
+        return parse_url_text(fh.read())